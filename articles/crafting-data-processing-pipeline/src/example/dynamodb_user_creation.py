@@ -0,0 +1,222 @@
+import random
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from threading import Condition, Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from example.context import Context, UserRecord
+from pipeline.memoize import side_effecting
+from pipeline.pipeline import ErrorHandler, NextStep, PipelineError
+
+MAX_BATCH_SIZE = 25
+THROTTLING_ERRORS = {"ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded"}
+
+
+# A buffered record together with what is needed to resume the pipeline for it once its batch is written.
+_Entry = Tuple[Context, UserRecord, NextStep]
+
+
+class BatchWriteError(PipelineError):
+    def __init__(self, failures: List[Tuple[Exception, List[UserRecord]]]) -> None:
+        records = sum(len(records) for _, records in failures)
+        super().__init__(f"{records} records in {len(failures)} batches were not written: {failures[0][0]}")
+        self.failures = failures
+
+
+@dataclass
+class WriteReport:
+    items: int = 0
+    batches: int = 0
+    requests: int = 0
+    retries: int = 0
+    throttles: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+
+class AdaptiveConcurrency:
+    def __init__(self, maximum: int) -> None:
+        self._maximum = maximum
+        self._limit = float(maximum)
+        self._active = 0
+        self._condition = Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._active >= int(self._limit):
+                self._condition.wait()
+            self._active += 1
+
+    def release(self, throttled: bool) -> None:
+        # Additive increase, multiplicative decrease: one throttled request halves the limit,
+        # a full window of successful requests grows it by one.
+        with self._condition:
+            self._active -= 1
+            if throttled:
+                self._limit = max(1.0, self._limit / 2)
+            else:
+                self._limit = min(float(self._maximum), self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+
+def _error_code(error: Exception) -> str:
+    return getattr(error, "response", {}).get("Error", {}).get("Code", "")
+
+
+@side_effecting
+class DynamoDBUserCreationStep:
+    def __init__(
+        self,
+        table: Any,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_concurrency: int = 8,
+        max_attempts: int = 10,
+        base_delay: float = 0.05,
+        max_delay: float = 5.0,
+        error_handler: Optional[ErrorHandler] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"Batch size must be between 1 and {MAX_BATCH_SIZE}, got: {batch_size}")
+        self._client = table.meta.client
+        self._table_name = table.name
+        keys = {key["KeyType"]: key["AttributeName"] for key in table.key_schema}
+        self._partition_key = keys["HASH"]
+        self._sort_key = keys.get("RANGE")
+        self._error_handler = error_handler
+        self._batch_size = batch_size
+        self._max_in_flight = 2 * max_concurrency
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._sleep = sleep
+        self._clock = clock
+        self._concurrency = AdaptiveConcurrency(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="dynamodb-sink")
+        self._batch: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        self._entries: List[_Entry] = []
+        self._in_flight: List[Tuple[Future, List[_Entry]]] = []
+        self._failures: List[Tuple[Exception, List[UserRecord]]] = []
+        self._report_lock = Lock()
+        self._report = WriteReport()
+        self._started_at: Optional[float] = None
+
+    @property
+    def concurrency(self) -> AdaptiveConcurrency:
+        return self._concurrency
+
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        # The rest of the pipeline runs for a record only once its batch is written.
+        if self._started_at is None:
+            self._started_at = self._clock()
+        item = self._to_item(context.record)
+        # A single BatchWriteItem call rejects duplicated keys, the latest record wins.
+        self._batch[item[self._partition_key], item.get(self._sort_key)] = item
+        self._entries.append((context, dict(context.record), next_step))
+        if len(self._batch) >= self._batch_size:
+            self._submit()
+
+    def flush(self) -> WriteReport:
+        if self._batch:
+            self._submit()
+        self._collect(wait_all=True)
+        if self._failures:
+            failures, self._failures = self._failures, []
+            raise BatchWriteError(failures)
+        report, self._report = self._report, WriteReport()
+        report.elapsed = self._clock() - self._started_at if self._started_at is not None else 0.0
+        self._started_at = None
+        return report
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _to_item(self, record: UserRecord) -> Dict[str, Any]:
+        item = {
+            self._partition_key: f"USER#{record['Email']}",
+            "first_name": record["FirstName"],
+            "last_name": record["LastName"],
+            "email": record["Email"],
+            "age": record["Age"],
+        }
+        if self._sort_key:
+            item[self._sort_key] = "PROFILE"
+        return item
+
+    def _submit(self) -> None:
+        items, self._batch = list(self._batch.values()), {}
+        entries, self._entries = self._entries, []
+        if len(self._in_flight) >= self._max_in_flight:
+            self._collect(wait_all=False)
+        self._in_flight.append((self._executor.submit(self._write, items), entries))
+
+    def _collect(self, wait_all: bool) -> None:
+        wait([future for future, _ in self._in_flight], return_when=ALL_COMPLETED if wait_all else FIRST_COMPLETED)
+        done, pending = [], []
+        for batch in self._in_flight:
+            (done if batch[0].done() else pending).append(batch)
+        self._in_flight = pending
+        for future, entries in done:
+            error = future.exception()
+            if error is None:
+                self._resume(entries, lambda context, next_step: next_step(context))
+            elif self._error_handler is not None:
+                self._resume(entries, lambda context, next_step: self._error_handler(error, context, next_step))
+            else:
+                # Raised from `flush`, a later record's call must not fail for a batch it does not belong to.
+                self._failures.append((error, [record for _, record, _ in entries]))
+
+    @staticmethod
+    def _resume(entries: List[_Entry], resume: Callable[[Context, NextStep], None]) -> None:
+        # Contexts are often shared between records, each one gets its own record back while it resumes.
+        for context, record, next_step in entries:
+            current, context.record = context.record, record
+            try:
+                resume(context, next_step)
+            finally:
+                context.record = current
+
+    def _write(self, items: List[Dict[str, Any]]) -> None:
+        requests = [{"PutRequest": {"Item": item}} for item in items]
+        attempt = 0
+        while True:
+            self._concurrency.acquire()
+            throttled = False
+            try:
+                response = self._client.batch_write_item(RequestItems={self._table_name: requests})
+                requests = response.get("UnprocessedItems", {}).get(self._table_name, [])
+                throttled = bool(requests)
+            except Exception as error:
+                if _error_code(error) not in THROTTLING_ERRORS:
+                    raise
+                throttled = True
+            finally:
+                self._concurrency.release(throttled)
+
+            self._record(requests=1, throttles=int(throttled))
+            if not throttled:
+                break
+            attempt += 1
+            if attempt >= self._max_attempts:
+                raise PipelineError(
+                    f"{len(requests)} items were not written to `{self._table_name}` after {attempt} attempts"
+                )
+            self._record(retries=1)
+            # Full jitter keeps retrying batches from hitting the table at the same moment.
+            self._sleep(random.uniform(0, min(self._max_delay, self._base_delay * 2 ** attempt)))
+
+        self._record(items=len(items), batches=1)
+
+    def _record(self, **counters: int) -> None:
+        with self._report_lock:
+            for name, value in counters.items():
+                setattr(self._report, name, getattr(self._report, name) + value)
@@ -2,9 +2,11 @@ import csv
 from typing import List
 
 from example.context import Context
+from pipeline.memoize import side_effecting
 from pipeline.pipeline import NextStep
 
 
+@side_effecting
 class FormatValidationStep:
     def __init__(self, headers: List[str]) -> None:
         self._headers = headers
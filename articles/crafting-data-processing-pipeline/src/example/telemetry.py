@@ -0,0 +1,250 @@
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Callable, Dict, List, Optional
+
+from example.context import Context
+from pipeline.pipeline import NextStep, PipelineStep
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    elapsed: float
+    records: int
+    rows_per_second: float
+    recent_rows_per_second: float
+    bytes_read: Optional[int]
+    total_bytes: Optional[int]
+    eta: Optional[float]
+    step_records: Dict[str, int] = field(default_factory=dict)
+    step_failures: Dict[str, int] = field(default_factory=dict)
+    max_rss_bytes: Optional[int] = None
+    final: bool = False
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.bytes_read is None or not self.total_bytes:
+            return None
+        return min(1.0, self.bytes_read / self.total_bytes)
+
+    @property
+    def failure_rates(self) -> Dict[str, float]:
+        return {
+            name: self.step_failures.get(name, 0) / records if records else 0.0
+            for name, records in self.step_records.items()
+        }
+
+
+Sink = Callable[[TelemetrySnapshot], None]
+
+
+def file_position(context: Context) -> Optional[int]:
+    # Text files refuse `tell()` while being iterated, the binary buffer below them does not.
+    try:
+        return getattr(context.file, "buffer", context.file).tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def file_size(context: Context) -> Optional[int]:
+    try:
+        return os.fstat(context.file.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def max_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def log_sink(target: logging.Logger = logger, level: int = logging.INFO) -> Sink:
+    def _log(snapshot: TelemetrySnapshot) -> None:
+        progress = f"{snapshot.progress:.1%}" if snapshot.progress is not None else "n/a"
+        eta = f"{snapshot.eta:.0f}s" if snapshot.eta is not None else "n/a"
+        failures = ", ".join(f"{name}={rate:.2%}" for name, rate in snapshot.failure_rates.items() if rate)
+        target.log(
+            level,
+            f"Imported {snapshot.records} records in {snapshot.elapsed:.1f}s "
+            f"({snapshot.recent_rows_per_second:.0f} rows/s), progress {progress}, eta {eta}, "
+            f"failures [{failures}], max rss {snapshot.max_rss_bytes}",
+        )
+
+    return _log
+
+
+class PrometheusTextFile:
+    def __init__(self, path: str, prefix: str = "import") -> None:
+        self._path = path
+        self._prefix = prefix
+
+    def __call__(self, snapshot: TelemetrySnapshot) -> None:
+        lines = []
+        self._metric(lines, "records_total", "counter", snapshot.records)
+        self._metric(lines, "rows_per_second", "gauge", snapshot.recent_rows_per_second)
+        self._metric(lines, "elapsed_seconds", "gauge", snapshot.elapsed)
+        self._metric(lines, "bytes_read", "gauge", snapshot.bytes_read)
+        self._metric(lines, "bytes_total", "gauge", snapshot.total_bytes)
+        self._metric(lines, "eta_seconds", "gauge", snapshot.eta)
+        self._metric(lines, "max_rss_bytes", "gauge", snapshot.max_rss_bytes)
+        self._labelled(lines, "step_records_total", snapshot.step_records)
+        self._labelled(lines, "step_failures_total", snapshot.step_failures)
+
+        # Scrapers must never see a half written file.
+        temporary = f"{self._path}.tmp"
+        with open(temporary, "w") as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(temporary, self._path)
+
+    def _metric(self, lines: List[str], name: str, kind: str, value: Optional[float]) -> None:
+        if value is None:
+            return
+        lines.append(f"# TYPE {self._prefix}_{name} {kind}")
+        lines.append(f"{self._prefix}_{name} {value}")
+
+    def _labelled(self, lines: List[str], name: str, values: Dict[str, int]) -> None:
+        lines.append(f"# TYPE {self._prefix}_{name} counter")
+        for step, value in values.items():
+            lines.append(f'{self._prefix}_{name}{{step="{step}"}} {value}')
+
+
+class _MonitoredStep:
+    def __init__(
+        self,
+        step: PipelineStep,
+        name: str,
+        telemetry: "ImportTelemetry",
+        counts_rows: bool,
+        calls: List[Optional[Exception]],
+    ) -> None:
+        self._step = step
+        self.name = name
+        self._telemetry = telemetry
+        self._counts_rows = counts_rows
+        self._calls = calls
+        self.pass_through = getattr(step, "pass_through", False)
+        self.records = 0
+        self.failures = 0
+
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        self.records += 1
+        if self._counts_rows:
+            self._telemetry.row(context)
+        # One slot per active call, a nested call leaves the error it let through in the slot of its caller.
+        self._calls.append(None)
+        try:
+            self._step(context, next_step)
+        except Exception as error:
+            # Errors travel up through the outer steps, only the step that raised them counts the failure.
+            if self._calls[-1] is not error:
+                self.failures += 1
+            if len(self._calls) > 1:
+                self._calls[-2] = error
+            raise
+        finally:
+            self._calls.pop()
+
+
+class ImportTelemetry:
+    def __init__(
+        self,
+        sinks: List[Sink],
+        interval: float = 10.0,
+        sample_every: int = 256,
+        rows_at: int = 1,
+        position: Callable[[Context], Optional[int]] = file_position,
+        total_bytes: Optional[int] = None,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self._sinks = sinks
+        self._interval = interval
+        self._sample_every = sample_every
+        self._rows_at = rows_at
+        self._position = position
+        self._total_bytes = total_bytes
+        self._clock = clock
+        self._steps: List[_MonitoredStep] = []
+        self._calls: List[Optional[Exception]] = []
+        self._records = 0
+        self._countdown = sample_every
+        self._started_at: Optional[float] = None
+        self._last_emit = (0.0, 0)
+        self._bytes_read: Optional[int] = None
+        self.last_snapshot: Optional[TelemetrySnapshot] = None
+
+    def instrument(self, steps: List[PipelineStep]) -> List[PipelineStep]:
+        names = [type(step).__name__ for step in steps]
+        self._steps = [
+            _MonitoredStep(
+                step, name if names.count(name) == 1 else f"{name}[{index}]", self, index == self._rows_at, self._calls
+            )
+            for index, (step, name) in enumerate(zip(steps, names))
+        ]
+        return list(self._steps)
+
+    def row(self, context: Context) -> None:
+        if self._started_at is None:
+            self.start()
+        self._records += 1
+        self._countdown -= 1
+        if self._countdown:
+            return
+        self._countdown = self._sample_every
+        now = self._clock()
+        if now - self._last_emit[0] >= self._interval:
+            self._sample(context)
+            self._emit(now)
+
+    def start(self) -> None:
+        self._started_at = self._clock()
+        self._last_emit = (self._started_at, 0)
+
+    def finish(self, context: Optional[Context] = None) -> TelemetrySnapshot:
+        if context is not None:
+            self._sample(context)
+        return self._emit(self._clock(), final=True)
+
+    def _sample(self, context: Context) -> None:
+        self._bytes_read = self._position(context)
+        if self._total_bytes is None:
+            self._total_bytes = file_size(context)
+
+    def _emit(self, now: float, final: bool = False) -> TelemetrySnapshot:
+        started_at = self._started_at if self._started_at is not None else now
+        elapsed = now - started_at
+        last_at, last_records = self._last_emit
+        snapshot = TelemetrySnapshot(
+            elapsed=elapsed,
+            records=self._records,
+            rows_per_second=self._records / elapsed if elapsed else 0.0,
+            recent_rows_per_second=(self._records - last_records) / (now - last_at) if now > last_at else 0.0,
+            bytes_read=self._bytes_read,
+            total_bytes=self._total_bytes,
+            eta=0.0 if final else self._eta(elapsed),
+            step_records={step.name: step.records for step in self._steps},
+            step_failures={step.name: step.failures for step in self._steps},
+            max_rss_bytes=max_rss_bytes(),
+            final=final,
+        )
+        self._last_emit = (now, self._records)
+        self.last_snapshot = snapshot
+        for sink in self._sinks:
+            sink(snapshot)
+        return snapshot
+
+    def _eta(self, elapsed: float) -> Optional[float]:
+        if not self._bytes_read or not self._total_bytes or not elapsed:
+            return None
+        return max(0.0, elapsed * (self._total_bytes - self._bytes_read) / self._bytes_read)
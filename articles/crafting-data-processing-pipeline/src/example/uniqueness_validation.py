@@ -1,9 +1,10 @@
 from typing import List
 
 from example.context import Context
-from pipeline.pipeline import NextStep
+from pipeline.pipeline import NextStep, pass_through
 
 
+@pass_through
 class UniquenessValidationStep:
     def __init__(self, reserved_emails: List[str]) -> None:
         self._reserved_emails = reserved_emails
@@ -2,9 +2,12 @@ from dataclasses import asdict
 from sqlite3 import Connection
 
 from example.context import Context, User
-from pipeline.pipeline import NextStep
+from pipeline.memoize import side_effecting
+from pipeline.pipeline import NextStep, pass_through
 
 
+@side_effecting
+@pass_through
 class UserCreationStep:
     def __init__(self, connection: Connection) -> None:
         self._connection = connection
@@ -31,4 +34,3 @@ class UserCreationStep:
             (db_record["first_name"], db_record["last_name"], db_record["email"], db_record["age"])
         )
         user.id = int(cursor.lastrowid)  # naive id generation
-
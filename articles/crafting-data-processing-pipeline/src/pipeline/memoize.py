@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from copy import copy, deepcopy
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from pipeline.pipeline import Context, NextStep, PipelineError, PipelineStep, StepClass
+
+
+def side_effecting(step_class: StepClass) -> StepClass:
+    step_class.memoizable = False
+    return step_class
+
+
+@dataclass
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    uncacheable: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class _Outcome:
+    changes: Dict[str, Any]
+    removed: Tuple[str, ...]
+    passed: bool
+    error: Optional[Exception] = None
+
+
+class _Recorder:
+    def __init__(self, record: Dict[str, Any], next_step: NextStep) -> None:
+        self._snapshot = dict(record)
+        self._record = record
+        self._next_step = next_step
+        self.calls = 0
+        self.outcome: Optional[_Outcome] = None
+
+    def __call__(self, context: Context) -> None:
+        self.calls += 1
+        if self.calls == 1:
+            # Cached values are copied, later records must not share mutable objects with this one.
+            changes = {
+                key: deepcopy(value)
+                for key, value in self._record.items()
+                if key not in self._snapshot or self._snapshot[key] is not value
+            }
+            removed = tuple(key for key in self._snapshot if key not in self._record)
+            self.outcome = _Outcome(changes, removed, passed=True)
+        self._next_step(context)
+
+
+class MemoizedStep:
+    def __init__(
+        self,
+        step: PipelineStep,
+        inputs: Sequence[str],
+        max_size: int = 10_000,
+        ttl: Optional[float] = None,
+        record: Callable[[Context], Dict[str, Any]] = lambda context: context.record,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if not getattr(step, "memoizable", True):
+            raise PipelineError(f"Step `{type(step).__name__}` has side effects and cannot be memoized.")
+        # A cache hit calls `next_step` directly, which is only safe when the step has no logic around it.
+        if not getattr(step, "pass_through", False):
+            raise PipelineError(f"Step `{type(step).__name__}` is not a pass-through step and cannot be memoized.")
+        self._step = step
+        self._inputs = tuple(inputs)
+        self._max_size = max_size
+        self._ttl = ttl
+        self._record = record
+        self._clock = clock
+        self._cache: OrderedDict[Hashable, Tuple[float, _Outcome]] = OrderedDict()
+        self.metrics = CacheMetrics()
+
+    @property
+    def step(self) -> PipelineStep:
+        return self._step
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        record = self._record(context)
+        key = tuple(record.get(field) for field in self._inputs)
+        try:
+            outcome = self._lookup(key)
+        except TypeError:
+            # Unhashable input values cannot be used as a key, the step simply runs.
+            self.metrics.uncacheable += 1
+            self._step(context, next_step)
+            return
+
+        if outcome is not None:
+            self.metrics.hits += 1
+            self._replay(outcome, record, context, next_step)
+            return
+
+        self.metrics.misses += 1
+        recorder = _Recorder(record, next_step)
+        try:
+            self._step(context, recorder)
+        except Exception as error:
+            # Errors raised after `next_step` may come from the steps below and are not a property of the input.
+            if not recorder.calls:
+                self._store_failure(key, error)
+            raise
+        if recorder.calls > 1:
+            self.metrics.uncacheable += 1
+            return
+        self._store(key, recorder.outcome or _Outcome({}, (), passed=False))
+
+    def _lookup(self, key: Hashable) -> Optional[_Outcome]:
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        expires_at, outcome = cached
+        if expires_at < self._clock():
+            del self._cache[key]
+            self.metrics.expirations += 1
+            return None
+        self._cache.move_to_end(key)
+        return outcome
+
+    def _store(self, key: Hashable, outcome: _Outcome) -> None:
+        expires_at = self._clock() + self._ttl if self._ttl is not None else float("inf")
+        self._cache[key] = (expires_at, outcome)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+            self.metrics.evictions += 1
+
+    def _store_failure(self, key: Hashable, error: Exception) -> None:
+        # Every cache hit raises its own copy, an error that cannot be copied is not cached at all.
+        try:
+            copy(error)
+        except Exception:
+            self.metrics.uncacheable += 1
+            return
+        self._store(key, _Outcome({}, (), passed=False, error=error))
+
+    @staticmethod
+    def _replay(outcome: _Outcome, record: Dict[str, Any], context: Context, next_step: NextStep) -> None:
+        if outcome.error is not None:
+            raise copy(outcome.error)
+        record.update(deepcopy(outcome.changes))
+        for key in outcome.removed:
+            record.pop(key, None)
+        if outcome.passed:
+            next_step(context)
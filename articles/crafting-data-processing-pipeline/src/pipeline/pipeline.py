@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import Generic, List, TypeVar, Callable, Protocol, Generator, Union, Iterable, Optional
+from typing import Generic, List, TypeVar, Callable, Protocol, Generator, Union, Iterable, Optional, Type
 
 Context = TypeVar("Context")
+StepClass = TypeVar("StepClass", bound=Type)
 
 
 class PipelineError(Exception):
@@ -22,6 +23,12 @@ class PipelineStep(Protocol[Context]):
         ...
 
 
+def pass_through(step_class: StepClass) -> StepClass:
+    # The step has no logic after `next_step`, which it calls at most once as its last action.
+    step_class.pass_through = True
+    return step_class
+
+
 def _default_error_handler(error: Exception, context: Context, next_step: NextStep) -> None:
     raise error
 
@@ -56,3 +63,43 @@ class Pipeline(Generic[Context]):
 
     def __len__(self) -> int:
         return len(self.queue)
+
+
+class IterativePipelineCursor(Generic[Context]):
+    def __init__(self, steps: List[PipelineStep], error_handler: ErrorHandler, position: int = 0):
+        self.queue = steps
+        self.error_handler: ErrorHandler = error_handler
+        self.position = position
+
+    def __call__(self, context: Context) -> None:
+        # Pass-through steps run in a loop, only wrapping steps get a cursor that nests the rest of the pipeline.
+        position = self.position
+        while position < len(self.queue):
+            current_step = self.queue[position]
+            if not getattr(current_step, "pass_through", False):
+                next_step = IterativePipelineCursor(self.queue, self.error_handler, position + 1)
+                try:
+                    current_step(context, next_step)
+                except Exception as error:
+                    self.error_handler(error, context, next_step)
+                return
+
+            continued: List[Context] = []
+            try:
+                current_step(context, continued.append)
+                if len(continued) > 1:
+                    raise PipelineError(f"Pass-through step `{current_step!r}` called its next step more than once.")
+            except Exception as error:
+                next_step = IterativePipelineCursor(self.queue, self.error_handler, position + 1)
+                self.error_handler(error, context, next_step)
+                return
+            if not continued:
+                return
+            context = continued[0]
+            position += 1
+
+
+class IterativePipeline(Pipeline[Context]):
+    def __call__(self, context: Context, error_handler: Optional[ErrorHandler] = None) -> None:
+        execute = IterativePipelineCursor(self.queue, error_handler or _default_error_handler)
+        execute(context)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Deque, Generic, List, Optional, Tuple
+
+from pipeline.pipeline import Context, ErrorHandler, NextStep, Pipeline, PipelineError, PipelineStep
+
+# Upper bounds of latency buckets in seconds, the last bucket catches everything above.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf")
+)
+
+
+@dataclass
+class LatencyHistogram:
+    counts: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    total: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, fraction: float) -> float:
+        threshold = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if count and seen >= threshold:
+                return bound
+        return 0.0
+
+
+@dataclass(frozen=True)
+class BatchingDecision:
+    batch_size: int
+    flush_interval: float
+    observed_p99: float
+    service_time: float
+
+
+class _TimedStep:
+    def __init__(self, step: PipelineStep, timings: List[float], index: int, clock: Callable[[], float]) -> None:
+        self._step = step
+        self._timings = timings
+        self._index = index
+        self._clock = clock
+
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        start = self._clock()
+        try:
+            self._step(context, next_step)
+        finally:
+            self._timings[self._index] += self._clock() - start
+
+
+class MicroBatchScheduler(Generic[Context]):
+    def __init__(
+        self,
+        pipeline: Pipeline[Context],
+        latency_target: float,
+        min_batch_size: int = 1,
+        max_batch_size: int = 1000,
+        max_flush_interval: float = 1.0,
+        window: int = 1000,
+        headroom: float = 0.8,
+        error_handler: Optional[ErrorHandler] = None,
+        after_batch: Optional[Callable[[List[Context]], None]] = None,
+        clock: Callable[[], float] = perf_counter,
+    ) -> None:
+        self._latency_target = latency_target
+        self._min_batch_size = min_batch_size
+        self._max_batch_size = max_batch_size
+        self._max_flush_interval = max_flush_interval
+        self._headroom = headroom
+        self._error_handler = error_handler
+        self._after_batch = after_batch
+        self._clock = clock
+        # Inclusive time spent in every step, a step's own time is its total minus the total of the next one.
+        self._step_totals = [0.0] * len(pipeline)
+        self._step_names = [type(step).__name__ for step in pipeline.queue]
+        self._pipeline = Pipeline[Context](
+            *[_TimedStep(step, self._step_totals, index, clock) for index, step in enumerate(pipeline.queue)]
+        )
+        self._queue: Deque[Tuple[Context, float]] = deque()
+        self._recent: Deque[float] = deque(maxlen=window)
+        self._processed = 0
+        self._service_time = 0.0
+        self.histogram = LatencyHistogram()
+        flush_interval = min(max_flush_interval, latency_target * headroom / 2)
+        self.decision = BatchingDecision(min_batch_size, flush_interval, 0.0, 0.0)
+        self.decisions: Deque[BatchingDecision] = deque([self.decision], maxlen=100)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def step_timings(self) -> List[Tuple[str, float]]:
+        if not self._processed:
+            return [(name, 0.0) for name in self._step_names]
+        totals = self._step_totals + [0.0]
+        return [
+            (name, (totals[index] - totals[index + 1]) / self._processed)
+            for index, name in enumerate(self._step_names)
+        ]
+
+    def submit(self, context: Context) -> None:
+        self._queue.append((context, self._clock()))
+        if len(self._queue) >= self.decision.batch_size:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self) -> None:
+        if self._queue and self._clock() - self._queue[0][1] >= self.decision.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._queue:
+            return
+        batch: List[Tuple[Context, float]] = []
+        failures: List[Exception] = []
+        started_at = self._clock()
+        try:
+            while self._queue and len(batch) < self.decision.batch_size:
+                batch.append(self._queue.popleft())
+                try:
+                    self._pipeline(batch[-1][0], self._error_handler)
+                except Exception as error:
+                    # The failed context already left the queue, the rest of the batch still runs.
+                    failures.append(error)
+        finally:
+            if batch and self._after_batch:
+                self._after_batch([context for context, _ in batch])
+            if batch:
+                self._complete([arrived_at for _, arrived_at in batch], started_at)
+        if len(failures) == 1:
+            raise failures[0]
+        if failures:
+            raise PipelineError(f"{len(failures)} contexts of a batch failed, first: {failures[0]!r}") from failures[0]
+
+    def _complete(self, arrivals: List[float], started_at: float) -> None:
+        finished_at = self._clock()
+        for arrived_at in arrivals:
+            latency = finished_at - arrived_at
+            self.histogram.observe(latency)
+            self._recent.append(latency)
+        self._processed += len(arrivals)
+        self._observe_service_time((finished_at - started_at) / len(arrivals))
+        self._adjust()
+
+    def _observe_service_time(self, seconds: float) -> None:
+        self._service_time = seconds if not self._service_time else 0.8 * self._service_time + 0.2 * seconds
+
+    def _adjust(self) -> None:
+        observed = sorted(self._recent)
+        p99 = observed[min(len(observed) - 1, math.ceil(0.99 * len(observed)) - 1)]
+        batch_size = self.decision.batch_size
+        if p99 > self._latency_target:
+            # Multiplicative decrease, proportional to how far the target was missed.
+            batch_size = int(batch_size * max(0.5, self._latency_target / p99))
+            # Latencies measured with the old batch size would keep pushing it down.
+            self._recent.clear()
+        elif p99 < self._latency_target * self._headroom:
+            batch_size = math.ceil(batch_size * 1.25)
+
+        # A full batch must still fit into the target together with the time its first item waited.
+        budget = self._latency_target * self._headroom
+        if self._service_time:
+            batch_size = min(batch_size, int(budget / self._service_time))
+        batch_size = max(self._min_batch_size, min(self._max_batch_size, batch_size))
+        flush_interval = max(0.0, min(self._max_flush_interval, budget - batch_size * self._service_time))
+
+        changed = (batch_size, flush_interval) != (self.decision.batch_size, self.decision.flush_interval)
+        self.decision = BatchingDecision(batch_size, flush_interval, p99, self._service_time)
+        if changed:
+            self.decisions.append(self.decision)
@@ -1,10 +1,15 @@
+import os
 from os import path
 from pathlib import Path
 from sqlite3 import Connection, connect
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
 
 import pytest
 import yaml
 
+pytest_plugins = ["marker_groups"]
+
 
 @pytest.fixture
 def test_dir() -> Path:
@@ -16,30 +21,116 @@ def fixture_dir(test_dir: Path) -> Path:
     return test_dir / "fixtures"
 
 
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
 @pytest.fixture
-def sqlite_db(fixture_dir: Path, request) -> Connection:
-    marker = request.node.get_closest_marker("sqlite_db")
-    connection = connect(":memory:")
-    cursor = connection.cursor()
-    cursor.execute("""
-        CREATE TABLE users (
-            id INTEGER PRIMARY KEY,
-            first_name TEXT,
-            last_name TEXT,
-            email TEXT,
-            age INTEGER
-        )
-    """)
-    if marker and "data" in marker.kwargs:
-        data_file = (fixture_dir / marker.kwargs["data"]).open(mode="r")
-        users = yaml.safe_load(data_file)
-        for user in users:
-            cursor.execute(
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+class SeededDatabases:
+    def __init__(self, fixture_dir: Path) -> None:
+        self._fixture_dir = fixture_dir
+        self._fixtures: Dict[str, List[Dict[str, Any]]] = {}
+        self._templates: Dict[Optional[str], Connection] = {}
+
+    def load_fixture(self, data_file: str) -> List[Dict[str, Any]]:
+        if data_file not in self._fixtures:
+            with (self._fixture_dir / data_file).open(mode="r") as file:
+                self._fixtures[data_file] = yaml.safe_load(file)
+        return self._fixtures[data_file]
+
+    def template(self, data_file: Optional[str]) -> Connection:
+        if data_file not in self._templates:
+            self._templates[data_file] = self._build(data_file)
+        return self._templates[data_file]
+
+    def clone(self, data_file: Optional[str]) -> Connection:
+        connection = connect(":memory:")
+        self.template(data_file).backup(connection)
+        return connection
+
+    def close(self) -> None:
+        for connection in self._templates.values():
+            connection.close()
+
+    def _build(self, data_file: Optional[str]) -> Connection:
+        connection = connect(":memory:")
+        cursor = connection.cursor()
+        cursor.execute("""
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY,
+                first_name TEXT,
+                last_name TEXT,
+                email TEXT,
+                age INTEGER
+            )
+        """)
+        if data_file:
+            cursor.executemany(
                 """
                    INSERT INTO users (first_name, last_name, email, age)
                    VALUES (?, ?, ?, ?)
                 """,
-                (user["first_name"], user["last_name"], user["email"], user["age"])
+                [
+                    (user["first_name"], user["last_name"], user["email"], user["age"])
+                    for user in self.load_fixture(data_file)
+                ]
             )
+        connection.commit()
+        return connection
+
+
+@pytest.fixture(scope="session")
+def seeded_databases() -> SeededDatabases:
+    databases = SeededDatabases(Path(path.dirname(__file__)) / "fixtures")
+    yield databases
+    databases.close()
+
+
+@pytest.fixture
+def sqlite_db(seeded_databases: SeededDatabases, request) -> Connection:
+    # Every distinct `data` file is seeded once per session, tests get their own copy of it.
+    marker = request.node.get_closest_marker("sqlite_db")
+    data_file = marker.kwargs.get("data") if marker else None
+    connection = seeded_databases.clone(data_file)
+    yield connection
+    connection.close()
+
 
-    return connection
+@pytest.fixture(scope="session")
+def dynamodb() -> Any:
+    boto3 = pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+    with moto.mock_dynamodb():
+        yield boto3.resource("dynamodb", region_name="eu-west-1")
+
+
+@pytest.fixture
+def dynamodb_table(dynamodb: Any, request) -> Any:
+    marker = request.node.get_closest_marker("dynamodb_table")
+    table_schema = {"name": "users", "pk": "pk", "sk": "sk", **(marker.kwargs if marker else {})}
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    table = dynamodb.create_table(
+        TableName=f"{table_schema['name']}-{worker}-{uuid4().hex[:8]}",
+        KeySchema=[
+            {"AttributeName": table_schema["pk"], "KeyType": "HASH"},
+            {"AttributeName": table_schema["sk"], "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": table_schema["pk"], "AttributeType": "S"},
+            {"AttributeName": table_schema["sk"], "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    yield table
+    table.delete()
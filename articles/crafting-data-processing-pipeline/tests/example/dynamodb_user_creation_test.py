@@ -0,0 +1,245 @@
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, List, TextIO
+from unittest.mock import MagicMock
+
+import pytest
+
+from example.dynamodb_user_creation import AdaptiveConcurrency, BatchWriteError, DynamoDBUserCreationStep
+
+
+@dataclass
+class Context:
+    file: TextIO
+    record: Dict[str, Any] = None
+    imported_records: int = 0
+
+
+class ThrottlingError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Throttled")
+        self.response = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
+
+
+class FakeTable:
+    def __init__(self, responses: List[Any] = None, pk: str = "pk", sk: str = "sk") -> None:
+        self.name = "users"
+        self.key_schema = [{"AttributeName": pk, "KeyType": "HASH"}, {"AttributeName": sk, "KeyType": "RANGE"}]
+        self._pk = pk
+        self.meta = MagicMock()
+        self.meta.client.batch_write_item.side_effect = self._batch_write_item
+        self.calls: List[List[Dict[str, Any]]] = []
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self._responses = list(responses or [])
+        self._lock = Lock()
+
+    def _batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        requests = RequestItems[self.name]
+        with self._lock:
+            self.calls.append(requests)
+            response = self._responses.pop(0) if self._responses else None
+        if isinstance(response, Exception):
+            raise response
+        unprocessed = requests[:response] if isinstance(response, int) else []
+        for request in requests[len(unprocessed):]:
+            item = request["PutRequest"]["Item"]
+            self.items[item[self._pk]] = item
+        return {"UnprocessedItems": {self.name: unprocessed} if unprocessed else {}}
+
+
+def _records(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"FirstName": "Bob", "LastName": f"Bobber{index}", "Email": f"bob{index}@test.com", "Age": 20 + index % 50}
+        for index in range(count)
+    ]
+
+
+def _import(step: DynamoDBUserCreationStep, context: Context, records: List[Dict[str, Any]]) -> List[str]:
+    resumed = []
+    for record in records:
+        context.record = record
+        step(context, lambda context: resumed.append(context.record["Email"]))
+    return resumed
+
+
+def test_can_write_users_in_batches_of_25() -> None:
+    # given
+    table = FakeTable()
+    step = DynamoDBUserCreationStep(table, sleep=lambda _: None)
+    context = Context(MagicMock())
+
+    # when
+    resumed = _import(step, context, _records(60))
+    report = step.flush()
+
+    # then
+    assert sorted(len(call) for call in table.calls) == [10, 25, 25]
+    assert len(table.items) == 60
+    assert table.items["USER#bob7@test.com"] == {
+        "pk": "USER#bob7@test.com",
+        "sk": "PROFILE",
+        "first_name": "Bob",
+        "last_name": "Bobber7",
+        "email": "bob7@test.com",
+        "age": 27,
+    }
+    assert resumed == [record["Email"] for record in _records(60)]
+    assert report.items == 60
+    assert report.batches == 3
+    assert report.retries == 0
+
+
+def test_duplicated_emails_in_a_batch_keep_the_latest_record() -> None:
+    # given
+    table = FakeTable()
+    step = DynamoDBUserCreationStep(table, sleep=lambda _: None)
+    context = Context(MagicMock())
+    records = _records(2) + [{**_records(1)[0], "Age": 99}]
+
+    # when
+    _import(step, context, records)
+    step.flush()
+
+    # then
+    assert len(table.calls) == 1
+    assert len(table.calls[0]) == 2
+    assert table.items["USER#bob0@test.com"]["age"] == 99
+
+
+def test_can_retry_unprocessed_items_and_throttling_errors() -> None:
+    # given
+    delays = []
+    table = FakeTable([3, ThrottlingError()])
+    step = DynamoDBUserCreationStep(table, max_concurrency=1, sleep=delays.append)
+    context = Context(MagicMock())
+
+    # when
+    resumed = _import(step, context, _records(10))
+    report = step.flush()
+
+    # then
+    assert [len(call) for call in table.calls] == [10, 3, 3]
+    assert len(table.items) == 10
+    assert report.requests == 3
+    assert report.retries == 2
+    assert report.throttles == 2
+    assert len(delays) == 2
+    assert len(resumed) == 10
+
+
+def test_fails_when_items_stay_unprocessed() -> None:
+    # given
+    table = FakeTable([1, 1, 1])
+    step = DynamoDBUserCreationStep(table, max_attempts=3, sleep=lambda _: None)
+    context = Context(MagicMock())
+
+    # when
+    resumed = _import(step, context, _records(5))
+
+    # then
+    with pytest.raises(BatchWriteError) as error:
+        step.flush()
+    assert resumed == []
+    assert [record["Email"] for record in error.value.failures[0][1]] == [record["Email"] for record in _records(5)]
+
+
+def test_resumes_records_only_after_their_batch_is_written() -> None:
+    # given
+    table = FakeTable()
+    step = DynamoDBUserCreationStep(table, sleep=lambda _: None)
+    context = Context(MagicMock())
+
+    # when
+    resumed = _import(step, context, _records(10))
+
+    # then
+    assert resumed == []
+    assert table.calls == []
+
+    # when
+    step.flush()
+
+    # then
+    assert len(resumed) == 10
+    assert context.imported_records == 0
+
+
+def test_passes_failed_batches_to_error_handler_with_their_own_records() -> None:
+    # given
+    failed = []
+    error = RuntimeError("Table is gone")
+    table = FakeTable([error])
+    step = DynamoDBUserCreationStep(
+        table,
+        batch_size=2,
+        max_concurrency=1,
+        error_handler=lambda error, context, next_step: failed.append((error, context.record["Email"])),
+        sleep=lambda _: None,
+    )
+    context = Context(MagicMock())
+
+    # when
+    resumed = _import(step, context, _records(4))
+    step.flush()
+
+    # then
+    assert failed == [(error, "bob0@test.com"), (error, "bob1@test.com")]
+    assert resumed == ["bob2@test.com", "bob3@test.com"]
+    assert context.record["Email"] == "bob3@test.com"
+
+
+def test_takes_key_names_from_table_schema() -> None:
+    # given
+    table = FakeTable(pk="PK", sk="SK")
+    step = DynamoDBUserCreationStep(table, sleep=lambda _: None)
+
+    # when
+    _import(step, Context(MagicMock()), _records(1))
+    step.flush()
+
+    # then
+    assert table.items["USER#bob0@test.com"]["SK"] == "PROFILE"
+    assert "pk" not in table.items["USER#bob0@test.com"]
+
+
+def test_adaptive_concurrency_backs_off_on_throttling_and_recovers() -> None:
+    # given
+    concurrency = AdaptiveConcurrency(8)
+
+    # when
+    concurrency.acquire()
+    concurrency.release(throttled=True)
+    concurrency.acquire()
+    concurrency.release(throttled=True)
+    throttled_limit = concurrency.limit
+    for _ in range(40):
+        concurrency.acquire()
+        concurrency.release(throttled=False)
+
+    # then
+    assert throttled_limit == 2
+    assert concurrency.limit == 8
+
+
+def test_rejects_batches_larger_than_dynamodb_allows() -> None:
+    with pytest.raises(ValueError):
+        DynamoDBUserCreationStep(FakeTable(), batch_size=26)
+
+
+@pytest.mark.dynamodb_table(pk="PK", sk="SK")
+def test_can_write_users_to_dynamodb_table(dynamodb_table: Any) -> None:
+    # given
+    step = DynamoDBUserCreationStep(dynamodb_table)
+    context = Context(MagicMock())
+
+    # when
+    resumed = _import(step, context, _records(30))
+    report = step.flush()
+    step.close()
+
+    # then
+    response = dynamodb_table.get_item(Key={"PK": "USER#bob3@test.com", "SK": "PROFILE"})
+    assert response["Item"]["last_name"] == "Bobber3"
+    assert dynamodb_table.scan(Select="COUNT")["Count"] == 30
+    assert report.items == 30
+    assert len(resumed) == 30
@@ -0,0 +1,156 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+import pytest
+
+from example.context import UserRecord
+from example.data_validation import DataValidationStep
+from example.format_validation import FormatValidationStep
+from example.telemetry import ImportTelemetry, PrometheusTextFile, TelemetrySnapshot, log_sink
+from pipeline.pipeline import NextStep, Pipeline
+
+
+@dataclass
+class Context:
+    file: TextIO
+    record: UserRecord = None
+    total_records: int = 0
+    imported_records: int = 0
+
+
+class TickStep:
+    def __init__(self, advance: Callable[[float], None]) -> None:
+        self._advance = advance
+
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        self._advance(0.5)
+        next_step(context)
+
+
+def _ignore_errors(error: Exception, context: Context, next_step: NextStep) -> None:
+    pass
+
+
+def _csv(path: Path, rows: int) -> Path:
+    lines = ["Name,Email,Age"]
+    for index in range(rows):
+        email = f"user{index}@test.com" if index % 4 else f"user{index}_test.com"
+        lines.append(f"User No{index},{email},{20 + index % 40}")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_reports_throughput_progress_and_failures(tmp_path: Path, clock: Any) -> None:
+    # given
+    snapshots = []
+    telemetry = ImportTelemetry([snapshots.append], interval=1.0, sample_every=4, clock=clock)
+    pipeline = Pipeline[Context](*telemetry.instrument([
+        FormatValidationStep(["Name", "Email", "Age"]),
+        TickStep(clock.advance),
+        DataValidationStep(),
+    ]))
+
+    # when
+    with _csv(tmp_path / "users.csv", 40).open(mode="r") as file:
+        context = Context(file)
+        pipeline(context, _ignore_errors)
+        final = telemetry.finish(context)
+
+    # then
+    assert 1 < len(snapshots) <= 11
+    assert snapshots[0].records == 4
+    assert snapshots[0].elapsed == 1.5
+    assert snapshots[1].recent_rows_per_second == 2.0
+    assert final.final
+    assert final.records == 40
+    assert final.bytes_read == final.total_bytes == (tmp_path / "users.csv").stat().st_size
+    assert final.progress == 1.0
+    assert final.step_records == {"FormatValidationStep": 1, "TickStep": 40, "DataValidationStep": 40}
+    assert final.step_failures == {"FormatValidationStep": 0, "TickStep": 0, "DataValidationStep": 10}
+    assert final.failure_rates["DataValidationStep"] == 0.25
+    assert final.max_rss_bytes is None or final.max_rss_bytes > 0
+
+
+def test_counts_every_failure_of_a_step_that_raises_the_same_error(clock: Any) -> None:
+    # given
+    error = ValueError("Invalid record")
+
+    class OuterStep:
+        def __call__(self, context: Context, next_step: NextStep) -> None:
+            next_step(context)
+
+    class FailingStep:
+        def __call__(self, context: Context, next_step: NextStep) -> None:
+            raise error
+
+    telemetry = ImportTelemetry([], clock=clock)
+    outer, failing = telemetry.instrument([OuterStep(), FailingStep()])
+
+    # when
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            outer(Context(None), lambda context: failing(context, lambda _: None))
+
+    # then
+    assert telemetry.finish().step_failures == {"OuterStep": 0, "FailingStep": 3}
+    assert vars(error) == {}
+
+
+def test_estimates_remaining_time_from_bytes_read(clock: Any) -> None:
+    # given
+    positions = iter([250, 500])
+    telemetry = ImportTelemetry(
+        [], interval=0.0, sample_every=1, rows_at=0, position=lambda _: next(positions), total_bytes=1000, clock=clock
+    )
+    step = telemetry.instrument([TickStep(clock.advance)])[0]
+    context = Context(None)
+
+    # when
+    step(context, lambda _: None)
+    step(context, lambda _: None)
+
+    # then
+    assert telemetry.last_snapshot.progress == 0.5
+    assert telemetry.last_snapshot.eta == pytest.approx(0.5)
+
+
+def test_writes_prometheus_text_file(tmp_path: Path) -> None:
+    # given
+    path = tmp_path / "import.prom"
+    sink = PrometheusTextFile(str(path))
+    snapshot = TelemetrySnapshot(
+        elapsed=2.0,
+        records=10,
+        rows_per_second=5.0,
+        recent_rows_per_second=4.0,
+        bytes_read=100,
+        total_bytes=None,
+        eta=None,
+        step_records={"DataValidationStep": 10},
+        step_failures={"DataValidationStep": 2},
+    )
+
+    # when
+    sink(snapshot)
+
+    # then
+    content = path.read_text()
+    assert "import_records_total 10\n" in content
+    assert "import_rows_per_second 4.0\n" in content
+    assert "import_bytes_total" not in content
+    assert 'import_step_failures_total{step="DataValidationStep"} 2\n' in content
+
+
+def test_logs_snapshot(caplog: pytest.LogCaptureFixture) -> None:
+    # given
+    sink = log_sink()
+    snapshot = TelemetrySnapshot(2.0, 10, 5.0, 4.0, 50, 100, 2.0, {"Step": 10}, {"Step": 1}, 1024)
+
+    # when
+    with caplog.at_level(logging.INFO):
+        sink(snapshot)
+
+    # then
+    assert "Imported 10 records in 2.0s (4 rows/s), progress 50.0%, eta 2s, failures [Step=10.00%]" in caplog.text
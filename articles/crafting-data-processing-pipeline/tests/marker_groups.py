@@ -0,0 +1,146 @@
+# Schedules tests sharing the same marker-parameterized fixture on the same pytest-xdist worker.
+import math
+from collections import defaultdict
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+DEFAULT_MARKERS = ["sqlite_db", "dynamodb_table"]
+GROUP = pytest.StashKey[Optional[str]]()
+
+
+def marker_group(item: Any, marker_names: List[str]) -> Optional[str]:
+    for name in marker_names:
+        marker = item.get_closest_marker(name)
+        if marker:
+            arguments = ", ".join(f"{key}={value!r}" for key, value in sorted(marker.kwargs.items()))
+            return f"{name}({arguments})"
+    return None
+
+
+def split_groups(groups: List[Optional[str]], workers: int) -> List[Optional[str]]:
+    # Large groups are split into at most one chunk per worker, so a fixture is built once per
+    # worker at most while the tests using it still spread across all of them.
+    sizes: Dict[str, int] = defaultdict(int)
+    for group in groups:
+        if group is not None:
+            sizes[group] += 1
+
+    seen: Dict[str, int] = defaultdict(int)
+    result = []
+    for group in groups:
+        if group is None or sizes[group] <= 1 or workers <= 1:
+            result.append(group)
+            continue
+        chunk_size = math.ceil(sizes[group] / workers)
+        result.append(f"{group}#{seen[group] // chunk_size}")
+        seen[group] += 1
+    return result
+
+
+class SetupTimes:
+    def __init__(self) -> None:
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.durations[name].append(seconds)
+
+    def merge(self, durations: Dict[str, List[float]]) -> None:
+        for name, seconds in durations.items():
+            self.durations[name].extend(seconds)
+
+    def lines(self, limit: int) -> List[str]:
+        ranked = sorted(self.durations.items(), key=lambda entry: sum(entry[1]), reverse=True)[:limit]
+        return [
+            f"{name}: {len(seconds)} setups, first {seconds[0] * 1000:.1f}ms, "
+            f"mean {sum(seconds) / len(seconds) * 1000:.1f}ms, max {max(seconds) * 1000:.1f}ms, "
+            f"total {sum(seconds) * 1000:.1f}ms"
+            for name, seconds in ranked
+        ]
+
+
+class MarkerGroupsPlugin:
+    def __init__(self, config: Any) -> None:
+        self._config = config
+        self._marker_names: List[str] = config.getini("marker_groups") or DEFAULT_MARKERS
+        self._report = config.getoption("fixture_setup_times")
+        self._current_group: Optional[str] = None
+        self.setup_times = SetupTimes()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config: Any, items: List[Any]) -> None:
+        groups = [marker_group(item, self._marker_names) for item in items]
+        workers = int(getattr(config, "workerinput", {}).get("workercount", 1))
+        for item, group, scheduled in zip(items, groups, split_groups(groups, workers)):
+            item.stash[GROUP] = group
+            if scheduled is not None:
+                item.add_marker(pytest.mark.xdist_group(name=scheduled))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item: Any) -> Any:
+        self._current_group = item.stash.get(GROUP, None)
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef: Any, request: Any) -> Any:
+        # Arguments of `parametrize` show up as pseudo fixtures, there is nothing to time for them.
+        if not self._report or getattr(fixturedef.func, "__name__", "") == "get_direct_param_fixture_func":
+            yield
+            return
+        start = perf_counter()
+        yield
+        name = fixturedef.argname
+        if name in self._marker_names and self._current_group:
+            name = self._current_group
+        self.setup_times.record(name, perf_counter() - start)
+
+    def pytest_sessionfinish(self, session: Any) -> None:
+        if hasattr(self._config, "workeroutput"):
+            self._config.workeroutput["fixture_setup_times"] = dict(self.setup_times.durations)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: Any, error: Any) -> None:
+        self.setup_times.merge(getattr(node, "workeroutput", {}).get("fixture_setup_times", {}))
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        lines = self.setup_times.lines(int(self._config.getini("marker_groups_report")))
+        if not lines:
+            return
+        terminalreporter.section("fixture setup time")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+
+def pytest_addoption(parser: Any) -> None:
+    parser.addoption(
+        "--fixture-setup-times",
+        action="store_true",
+        default=False,
+        help="Print fixture setup times, grouped by marker kwargs for the marker-driven fixtures.",
+    )
+    parser.addini("marker_groups", type="linelist", help="Markers whose kwargs group tests on a single worker.")
+    parser.addini("marker_groups_report", default="10", help="Number of fixtures listed in the setup time summary.")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config: Any) -> None:
+    # `-n` alone spreads tests one by one, groups are only honoured by the `loadgroup` scheduler.
+    # This runs before pytest-xdist turns a missing `--dist` into `load`, so an explicit choice is kept.
+    option = config.option
+    if getattr(option, "numprocesses", None) and getattr(option, "dist", "no") == "no" and not option.distload:
+        option.dist = "loadgroup"
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: Any) -> None:
+    # Workers parse the original command line again and would not know the scheduler was switched.
+    node.workerinput["marker_groups_loadgroup"] = node.config.option.dist == "loadgroup"
+
+
+def pytest_configure(config: Any) -> None:
+    config.addinivalue_line("markers", "xdist_group(name): run tests of the same group on one pytest-xdist worker")
+    if getattr(config, "workerinput", {}).get("marker_groups_loadgroup"):
+        # pytest-xdist tags the node ids of grouped tests on the workers only when this flag is set.
+        config.option.loadgroup = True
+    config.pluginmanager.register(MarkerGroupsPlugin(config), "marker_groups_plugin")
@@ -0,0 +1,132 @@
+import os
+import re
+from unittest.mock import MagicMock
+
+import pytest
+
+import marker_groups
+from marker_groups import marker_group, split_groups
+
+pytest_plugins = ["pytester"]
+
+
+def test_groups_tests_by_marker_kwargs() -> None:
+    # given
+    item = MagicMock()
+    item.get_closest_marker.side_effect = lambda name: (
+        pytest.mark.sqlite_db(data="users.yaml", schema="v1").mark if name == "sqlite_db" else None
+    )
+
+    # when
+    group = marker_group(item, ["sqlite_db", "dynamodb_table"])
+
+    # then
+    assert group == "sqlite_db(data='users.yaml', schema='v1')"
+
+
+def test_splits_groups_into_one_chunk_per_worker() -> None:
+    # given
+    groups = ["a"] * 6 + [None, "b", "a"]
+
+    # when
+    scheduled = split_groups(groups, workers=3)
+
+    # then
+    assert scheduled == ["a#0", "a#0", "a#0", "a#1", "a#1", "a#1", None, "b", "a#2"]
+
+
+def test_keeps_groups_whole_without_workers() -> None:
+    # given
+    groups = ["a", "a", None]
+
+    # when
+    scheduled = split_groups(groups, workers=1)
+
+    # then
+    assert scheduled == groups
+
+
+def test_reports_setup_time_per_marker_group(pytester: pytest.Pytester) -> None:
+    # given
+    pytester.makeconftest("""
+        import pytest
+
+        pytest_plugins = ["marker_groups"]
+
+        @pytest.fixture
+        def sqlite_db(request):
+            return request.node.get_closest_marker("sqlite_db").kwargs["data"]
+    """)
+    pytester.makepyfile("""
+        import pytest
+
+        @pytest.mark.sqlite_db(data="users.yaml")
+        def test_users(sqlite_db):
+            assert sqlite_db == "users.yaml"
+
+        @pytest.mark.parametrize("email", ["bob@test.com"])
+        @pytest.mark.sqlite_db(data="orders.yaml")
+        def test_orders(sqlite_db, email):
+            assert sqlite_db == "orders.yaml"
+    """)
+
+    # when
+    result = pytester.runpytest_inprocess("--fixture-setup-times")
+
+    # then
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines([
+        "*fixture setup time*",
+        "sqlite_db(data='orders.yaml'): 1 setups*",
+    ])
+    result.stdout.fnmatch_lines(["sqlite_db(data='users.yaml'): 1 setups*"])
+    result.stdout.no_fnmatch_line("email: *")
+
+    # when
+    result = pytester.runpytest_inprocess()
+
+    # then
+    result.assert_outcomes(passed=2)
+    result.stdout.no_fnmatch_line("*fixture setup time*")
+
+
+def test_keeps_marker_groups_on_one_worker(pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    pytest.importorskip("xdist")
+    monkeypatch.setenv("PYTHONPATH", os.path.dirname(marker_groups.__file__))
+    pytester.makeconftest("""
+        import pytest
+
+        pytest_plugins = ["marker_groups"]
+
+        @pytest.fixture
+        def sqlite_db(request):
+            return request.node.get_closest_marker("sqlite_db").kwargs["data"]
+    """)
+    pytester.makepyfile("""
+        import pytest
+
+        @pytest.mark.parametrize("index", range(4))
+        @pytest.mark.sqlite_db(data="users.yaml")
+        def test_users(sqlite_db, index):
+            assert sqlite_db == "users.yaml"
+    """)
+
+    # when
+    result = pytester.runpytest_subprocess("-n", "2", "-v")
+
+    # then
+    result.assert_outcomes(passed=4)
+    workers = dict(
+        (int(match.group(2)), match.group(1))
+        for match in re.finditer(r"\[(gw\d+)\].* PASSED .*test_users\[(\d)\]", result.stdout.str())
+    )
+    assert workers[0] == workers[1]
+    assert workers[2] == workers[3]
+
+    # when
+    result = pytester.runpytest_subprocess("-n", "2", "-v", "--dist", "load")
+
+    # then
+    result.assert_outcomes(passed=4)
+    result.stdout.no_fnmatch_line("*test_users*@sqlite_db*")
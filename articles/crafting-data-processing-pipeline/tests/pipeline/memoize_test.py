@@ -0,0 +1,198 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from example.data_validation import DataValidationStep
+from example.user_creation import UserCreationStep
+from pipeline.memoize import MemoizedStep
+from pipeline.pipeline import NextStep, Pipeline, PipelineError, pass_through
+
+
+@dataclass
+class Context:
+    record: Dict[str, Any]
+    seen: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@pass_through
+class UpperNameStep:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        self.calls += 1
+        if not context.record["Name"]:
+            raise ValueError("Missing name")
+        if context.record["Name"] == "skip":
+            return
+        context.record["Upper"] = context.record["Name"].upper()
+        del context.record["Raw"]
+        next_step(context)
+
+
+class CollectStep:
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        context.seen.append(dict(context.record))
+        next_step(context)
+
+
+def test_reapplies_cached_changes_on_hit() -> None:
+    # given
+    step = UpperNameStep()
+    memoized = MemoizedStep(step, inputs=["Name"])
+    pipeline = Pipeline[Context](memoized, CollectStep())
+    contexts = [Context({"Name": name, "Raw": index}) for index, name in enumerate(["bob", "ann", "bob"])]
+
+    # when
+    for context in contexts:
+        pipeline(context)
+
+    # then
+    assert step.calls == 2
+    assert contexts[2].seen == [{"Name": "bob", "Upper": "BOB"}]
+    assert memoized.metrics.hits == 1
+    assert memoized.metrics.misses == 2
+    assert memoized.metrics.hit_rate == pytest.approx(1 / 3)
+
+
+def test_caches_errors_and_filtered_records() -> None:
+    # given
+    step = UpperNameStep()
+    memoized = MemoizedStep(step, inputs=["Name"])
+    next_step = MagicMock()
+
+    # when
+    for _ in range(2):
+        memoized(Context({"Name": "skip", "Raw": 1}), next_step)
+        with pytest.raises(ValueError):
+            memoized(Context({"Name": "", "Raw": 1}), next_step)
+
+    # then
+    assert step.calls == 2
+    assert not next_step.called
+
+
+def test_raises_own_error_instance_on_every_hit() -> None:
+    # given
+    memoized = MemoizedStep(UpperNameStep(), inputs=["Name"])
+    errors = []
+
+    # when
+    for _ in range(3):
+        with pytest.raises(ValueError) as error:
+            memoized(Context({"Name": "", "Raw": 1}), MagicMock())
+        errors.append(error.value)
+
+    # then
+    assert len({id(error) for error in errors}) == 3
+    assert all(str(error) == "Missing name" for error in errors)
+
+
+def test_records_do_not_share_cached_values() -> None:
+    # given
+    @pass_through
+    class TagStep:
+        def __call__(self, context: Context, next_step: NextStep) -> None:
+            context.record["Tags"] = ["new"]
+            next_step(context)
+
+    memoized = MemoizedStep(TagStep(), inputs=["Name"])
+    records = [{"Name": "bob"} for _ in range(3)]
+
+    # when
+    for record in records:
+        memoized(Context(record), MagicMock())
+    records[0]["Tags"].append("first")
+    records[1]["Tags"].append("second")
+
+    # then
+    assert memoized.metrics.hits == 2
+    assert [record["Tags"] for record in records] == [["new", "first"], ["new", "second"], ["new"]]
+
+
+def test_does_not_cache_errors_raised_by_next_steps() -> None:
+    # given
+    step = UpperNameStep()
+    memoized = MemoizedStep(step, inputs=["Name"])
+    next_step = MagicMock(side_effect=RuntimeError("Database is down"))
+
+    # when
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            memoized(Context({"Name": "bob", "Raw": 1}), next_step)
+
+    # then
+    assert step.calls == 2
+    assert len(memoized) == 0
+
+
+def test_evicts_least_recently_used_and_expired_entries(clock: Any) -> None:
+    # given
+    memoized = MemoizedStep(UpperNameStep(), inputs=["Name"], max_size=2, ttl=10.0, clock=clock)
+    next_step = MagicMock()
+
+    # when
+    for name in ["a", "b", "a", "c"]:
+        memoized(Context({"Name": name, "Raw": 1}), next_step)
+    clock.advance(11.0)
+    memoized(Context({"Name": "a", "Raw": 1}), next_step)
+
+    # then
+    assert memoized.metrics.evictions == 1
+    assert memoized.metrics.expirations == 1
+    assert memoized.metrics.hits == 1
+    assert len(memoized) == 2
+
+
+def test_can_memoize_data_validation() -> None:
+    # given
+    step = DataValidationStep()
+    memoized = MemoizedStep(step, inputs=["Name", "Email", "Age"])
+    first = Context({"Name": "Bob Bobber", "Email": "bob@test.com", "Age": "12"})
+    second = Context({"Name": "Bob Bobber", "Email": "bob@test.com", "Age": "12"})
+
+    # when
+    memoized(first, MagicMock())
+    memoized(second, MagicMock())
+
+    # then
+    assert second.record == first.record == {
+        "Name": "Bob Bobber",
+        "Email": "bob@test.com",
+        "Age": 12,
+        "FirstName": "Bob",
+        "LastName": "Bobber",
+    }
+    assert memoized.metrics.hits == 1
+
+
+def test_data_validation_lets_errors_of_next_steps_through_on_hit_and_miss() -> None:
+    # given
+    memoized = MemoizedStep(DataValidationStep(), inputs=["Name", "Email", "Age"])
+    failing_next_step = MagicMock(side_effect=KeyError("Id"))
+
+    def record() -> Dict[str, Any]:
+        return {"Name": "Bob Bobber", "Email": "bob@test.com", "Age": "12"}
+
+    # when
+    with pytest.raises(KeyError):
+        memoized(Context(record()), failing_next_step)
+    memoized(Context(record()), MagicMock())
+    with pytest.raises(KeyError):
+        memoized(Context(record()), failing_next_step)
+
+    # then
+    assert memoized.metrics.misses == 2
+    assert memoized.metrics.hits == 1
+
+
+def test_steps_not_marked_as_pass_through_cannot_be_memoized() -> None:
+    with pytest.raises(PipelineError):
+        MemoizedStep(CollectStep(), inputs=["Name"])
+
+
+def test_side_effecting_steps_cannot_be_memoized() -> None:
+    with pytest.raises(PipelineError):
+        MemoizedStep(UserCreationStep(MagicMock()), inputs=["Email"])
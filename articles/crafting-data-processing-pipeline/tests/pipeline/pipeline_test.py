@@ -1,7 +1,10 @@
+import traceback
 from dataclasses import dataclass, field
 from typing import Dict, Any, List, Generator, Iterable
 
-from pipeline.pipeline import Pipeline, PipelineStep, NextStep
+import pytest
+
+from pipeline.pipeline import IterativePipeline, Pipeline, PipelineError, PipelineStep, NextStep, pass_through
 
 
 def test_can_instantiate_pipeline() -> None:
@@ -52,3 +55,94 @@ def test_can_run_pipeline() -> None:
     # then
     assert context.executed_steps == steps
 
+
+@pass_through
+class IncrementStep:
+    def __call__(self, context: Dict[str, int], next_step: NextStep) -> None:
+        context["value"] += 1
+        next_step(context)
+
+
+def test_can_run_long_pipeline_of_pass_through_steps_iteratively() -> None:
+    # given
+    pipeline = IterativePipeline[Dict[str, int]](*[IncrementStep() for _ in range(5000)])
+    context = {"value": 0}
+
+    # when
+    pipeline(context)
+
+    # then
+    assert context["value"] == 5000
+
+
+def test_iterative_pipeline_keeps_nesting_of_wrapping_steps() -> None:
+    # given
+    @dataclass
+    class Context:
+        trace: List[str] = field(default_factory=list)
+
+    class WrappingStep:
+        def __call__(self, context: Context, next_step: NextStep) -> None:
+            context.trace.append("before")
+            next_step(context)
+            context.trace.append("after")
+
+    @pass_through
+    class TraceStep:
+        def __call__(self, context: Context, next_step: NextStep) -> None:
+            context.trace.append("step")
+            next_step(context)
+
+    @pass_through
+    class FilterStep:
+        def __call__(self, context: Context, next_step: NextStep) -> None:
+            pass
+
+    context = Context()
+    pipeline = IterativePipeline[Context](TraceStep(), WrappingStep(), TraceStep(), FilterStep(), TraceStep())
+
+    # when
+    pipeline(context)
+
+    # then
+    assert context.trace == ["step", "before", "step", "after"]
+
+
+def test_iterative_pipeline_passes_errors_to_handler() -> None:
+    # given
+    @pass_through
+    class FailingStep:
+        def __call__(self, context: Dict[str, int], next_step: NextStep) -> None:
+            raise ValueError("Invalid record")
+
+    errors = []
+
+    def _error_handler(error: Exception, context: Dict[str, int], next_step: NextStep) -> None:
+        errors.append(error)
+        next_step(context)
+
+    pipeline = IterativePipeline[Dict[str, int]](IncrementStep(), FailingStep(), IncrementStep())
+    context = {"value": 0}
+
+    # when
+    pipeline(context, _error_handler)
+
+    # then
+    assert context["value"] == 2
+    assert len(errors) == 1
+    assert len(traceback.extract_tb(errors[0].__traceback__)) <= 2
+
+
+def test_pass_through_step_cannot_fan_out() -> None:
+    # given
+    @pass_through
+    class FanOutStep:
+        def __call__(self, context: Dict[str, int], next_step: NextStep) -> None:
+            next_step(context)
+            next_step(context)
+
+    pipeline = IterativePipeline[Dict[str, int]](FanOutStep(), IncrementStep())
+
+    # when / then
+    with pytest.raises(PipelineError):
+        pipeline({"value": 0})
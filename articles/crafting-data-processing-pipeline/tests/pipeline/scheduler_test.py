@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from typing import Any, Callable, List
+
+import pytest
+
+from pipeline.pipeline import NextStep, Pipeline
+from pipeline.scheduler import LatencyHistogram, MicroBatchScheduler
+
+
+@dataclass
+class Context:
+    value: int
+    processed: bool = False
+
+
+class SlowStep:
+    def __init__(self, advance: Callable[[float], None], seconds: float) -> None:
+        self._advance = advance
+        self.seconds = seconds
+
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        self._advance(self.seconds)
+        next_step(context)
+
+
+class MarkStep:
+    def __call__(self, context: Context, next_step: NextStep) -> None:
+        context.processed = True
+        next_step(context)
+
+
+def test_grows_batch_size_while_latency_is_below_target(clock: Any) -> None:
+    # given
+    batches: List[int] = []
+    pipeline = Pipeline[Context](SlowStep(clock.advance, 0.001), MarkStep())
+    scheduler = MicroBatchScheduler(
+        pipeline, latency_target=0.1, clock=clock, after_batch=lambda batch: batches.append(len(batch))
+    )
+    contexts = [Context(index) for index in range(500)]
+
+    # when
+    for context in contexts:
+        scheduler.submit(context)
+    scheduler.flush()
+
+    # then
+    assert all(context.processed for context in contexts)
+    assert batches[0] == 1
+    assert max(batches) > 10
+    assert scheduler.decision.batch_size * scheduler.decision.service_time <= 0.08
+    assert scheduler.histogram.count == 500
+    assert scheduler.histogram.percentile(0.99) <= 0.1
+    assert len(scheduler.decisions) > 1
+
+
+def test_shrinks_batch_size_when_steps_slow_down(clock: Any) -> None:
+    # given
+    slow_step = SlowStep(clock.advance, 0.001)
+    scheduler = MicroBatchScheduler(Pipeline[Context](slow_step), latency_target=0.1, clock=clock)
+    for index in range(500):
+        scheduler.submit(Context(index))
+    grown = scheduler.decision.batch_size
+
+    # when
+    slow_step.seconds = 0.01
+    for index in range(200):
+        scheduler.submit(Context(index))
+
+    # then
+    assert scheduler.decision.batch_size < grown
+    assert scheduler.decision.batch_size <= 8
+
+
+def test_flushes_partial_batch_after_flush_interval(clock: Any) -> None:
+    # given
+    scheduler = MicroBatchScheduler(Pipeline[Context](MarkStep()), latency_target=0.1, min_batch_size=10, clock=clock)
+    context = Context(1)
+    scheduler.submit(context)
+
+    # when
+    scheduler.poll()
+    waiting = scheduler.pending
+    clock.advance(scheduler.decision.flush_interval)
+    scheduler.poll()
+
+    # then
+    assert waiting == 1
+    assert scheduler.pending == 0
+    assert context.processed
+
+
+def test_reports_own_time_of_every_step(clock: Any) -> None:
+    # given
+    pipeline = Pipeline[Context](SlowStep(clock.advance, 0.002), SlowStep(clock.advance, 0.003), MarkStep())
+    scheduler = MicroBatchScheduler(pipeline, latency_target=0.1, clock=clock)
+
+    # when
+    for index in range(10):
+        scheduler.submit(Context(index))
+    scheduler.flush()
+
+    # then
+    timings = scheduler.step_timings()
+    assert [name for name, _ in timings] == ["SlowStep", "SlowStep", "MarkStep"]
+    assert [round(seconds, 6) for _, seconds in timings] == [0.002, 0.003, 0.0]
+
+
+def test_histogram_reports_bucket_of_percentile() -> None:
+    # given
+    histogram = LatencyHistogram()
+
+    # when
+    for _ in range(98):
+        histogram.observe(0.002)
+    histogram.observe(0.2)
+    histogram.observe(3.0)
+
+    # then
+    assert histogram.percentile(0.5) == 0.0025
+    assert histogram.percentile(0.99) == 0.25
+    assert histogram.percentile(1.0) == 5.0
+
+
+def test_failing_context_does_not_block_the_queue(clock: Any) -> None:
+    # given
+    class FailingStep:
+        def __call__(self, context: Context, next_step: NextStep) -> None:
+            if context.value == 1:
+                raise ValueError("Invalid value")
+            next_step(context)
+
+    scheduler = MicroBatchScheduler(
+        Pipeline[Context](FailingStep(), MarkStep()), latency_target=10.0, min_batch_size=3, clock=clock
+    )
+    contexts = [Context(index) for index in range(4)]
+
+    # when
+    scheduler.submit(contexts[0])
+    scheduler.submit(contexts[1])
+    with pytest.raises(ValueError):
+        scheduler.submit(contexts[2])
+    scheduler.submit(contexts[3])
+    scheduler.flush()
+
+    # then
+    assert scheduler.pending == 0
+    assert [context.processed for context in contexts] == [True, False, True, True]
+    assert scheduler.histogram.count == 4
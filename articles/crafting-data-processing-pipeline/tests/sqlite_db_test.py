@@ -0,0 +1,22 @@
+from sqlite3 import Connection
+
+import pytest
+
+
+@pytest.mark.sqlite_db(data="users.yaml")
+@pytest.mark.parametrize("email", ["first@test.com", "second@test.com"])
+def test_each_test_gets_isolated_copy(sqlite_db: Connection, email: str) -> None:
+    # when
+    sqlite_db.execute(
+        "INSERT INTO users (first_name, last_name, email, age) VALUES (?, ?, ?, ?)",
+        ("Test", "User", email, 30),
+    )
+
+    # then
+    emails = [row[0] for row in sqlite_db.execute("SELECT email FROM users ORDER BY id")]
+    assert emails == ["bob.pop@mail.com", email]
+
+
+def test_creates_empty_table_without_data(sqlite_db: Connection) -> None:
+    # then
+    assert sqlite_db.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
@@ -1,32 +1,43 @@
 import json
+import os
 from os import path
+from typing import Dict, Tuple
+from uuid import uuid4
 
 import boto3
 import moto
 import pytest
 
+pytest_plugins = ["marker_groups"]
 
-@pytest.fixture
-def test_dir():
-    return path.join(path.dirname(__file__))
+REGION = "eu-west-1"
 
 
-@pytest.fixture
-def dynamodb_table(test_dir, request):
-    # Default table schema
-    table_schema = {
-        "table_name": "default",
-        "pk": "pk",
-        "sk": "sk",
-    }
-    if request.node.get_closest_marker("dynamodb_table"):
-        table_schema = {**table_schema, **request.node.get_closest_marker("dynamodb_table").kwargs}
+def _unique_table_name(name: str) -> str:
+    # Unique per xdist worker and per test, so tables never collide between parallel tests.
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    return f"{name}-{worker}-{uuid4().hex[:8]}"
 
-    # Create table and load data
-    with moto.mock_dynamodb():
-        dynamodb = boto3.resource("dynamodb", region_name="eu-west-1")
-        table = dynamodb.create_table(
-            TableName=table_schema["name"],
+
+class DynamoDBTemplates:
+    def __init__(self, dynamodb, test_dir: str) -> None:
+        self._dynamodb = dynamodb
+        self._client = dynamodb.meta.client
+        self._test_dir = test_dir
+        self._backups: Dict[Tuple[str, str, str, str], str] = {}
+
+    def create(self, table_schema: dict):
+        key = (table_schema["name"], table_schema["pk"], table_schema["sk"], table_schema.get("data", ""))
+        if key not in self._backups:
+            self._backups[key] = self._create_template(table_schema)
+
+        name = _unique_table_name(table_schema["name"])
+        self._client.restore_table_from_backup(TargetTableName=name, BackupArn=self._backups[key])
+        return self._dynamodb.Table(name)
+
+    def _create_template(self, table_schema: dict) -> str:
+        template = self._dynamodb.create_table(
+            TableName=_unique_table_name(f"{table_schema['name']}-template"),
             KeySchema=[
                 {"AttributeName": table_schema["pk"], "KeyType": "HASH"},
                 {"AttributeName": table_schema["sk"], "KeyType": "RANGE"},
@@ -38,11 +49,42 @@ def dynamodb_table(test_dir, request):
             BillingMode="PAY_PER_REQUEST",
         )
         if "data" in table_schema:
-            data = json.load(open(path.join(test_dir, table_schema["data"]), "r"))
+            with open(path.join(self._test_dir, table_schema["data"]), "r") as file:
+                data = json.load(file)
 
-            with table.batch_writer() as process:
-                for index, record in enumerate(data):
+            with template.batch_writer() as process:
+                for record in data:
                     process.put_item(Item=record)
-        yield table
-        client = boto3.client("dynamodb", region_name="eu-west-1")
-        client.delete_table(TableName=table_schema["name"])
+
+        backup = self._client.create_backup(TableName=template.name, BackupName=f"{template.name}-backup")
+        return backup["BackupDetails"]["BackupArn"]
+
+
+@pytest.fixture
+def test_dir():
+    return path.join(path.dirname(__file__))
+
+
+@pytest.fixture(scope="session")
+def dynamodb_templates():
+    # One mocked backend for the whole session, seeded templates are restored for every test.
+    with moto.mock_dynamodb():
+        dynamodb = boto3.resource("dynamodb", region_name=REGION)
+        yield DynamoDBTemplates(dynamodb, path.dirname(__file__))
+
+
+@pytest.fixture
+def dynamodb_table(dynamodb_templates, request):
+    # Default table schema
+    table_schema = {
+        "name": "default",
+        "pk": "pk",
+        "sk": "sk",
+    }
+    if request.node.get_closest_marker("dynamodb_table"):
+        table_schema = {**table_schema, **request.node.get_closest_marker("dynamodb_table").kwargs}
+
+    # Create table and load data
+    table = dynamodb_templates.create(table_schema)
+    yield table
+    table.delete()
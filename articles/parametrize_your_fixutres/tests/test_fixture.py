@@ -14,3 +14,19 @@ def test_parametrized_fixture(dynamodb_table) -> None:
 
     # then
     assert len(response["Items"]) == 3
+
+
+@pytest.mark.parametrize("attempt", [1, 2])
+@pytest.mark.dynamodb_table(name="test_table", data="fixtures/pets.json")
+def test_tables_are_isolated_between_tests(dynamodb_table, attempt) -> None:
+    # given
+    dynamodb_table.put_item(Item={"pk": "Pet", "sk": f"added-{attempt}"})
+
+    # when
+    response = dynamodb_table.query(
+        KeyConditionExpression="pk = :pk",
+        ExpressionAttributeValues={":pk": "Pet"}
+    )
+
+    # then
+    assert len(response["Items"]) == 4
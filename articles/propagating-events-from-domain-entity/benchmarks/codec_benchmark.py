@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pickle
+import random
+from time import perf_counter
+from typing import Callable, List
+
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.codec import BinaryCodec, JsonCodec, wallet_registry
+
+EVENTS = 100_000
+
+
+def _events() -> List[DomainEvent]:
+    random.seed(1)
+    events: List[DomainEvent] = []
+    while len(events) < EVENTS:
+        wallet = Wallet(Money(1_000))
+        wallet.transact_many([Money(random.randint(-100, 100)) for _ in range(100)])
+        events.extend(wallet.collect_events())
+    return events[:EVENTS]
+
+
+def _run(name: str, encode: Callable, decode: Callable, events: List[DomainEvent]) -> None:
+    start = perf_counter()
+    data = encode(events)
+    encode_time = perf_counter() - start
+    start = perf_counter()
+    decode(data)
+    decode_time = perf_counter() - start
+    print(
+        f"{name:<12} encode: {EVENTS / encode_time:>9.0f} events/s  "
+        f"decode: {EVENTS / decode_time:>9.0f} events/s  "
+        f"size: {len(data) / EVENTS:>6.1f} bytes/event"
+    )
+
+
+def benchmark() -> None:
+    events = _events()
+    binary = BinaryCodec(wallet_registry())
+    json_codec = JsonCodec(wallet_registry())
+    _run("binary", binary.encode_many, binary.decode_many, events)
+    _run("pickle", lambda items: pickle.dumps(items, pickle.HIGHEST_PROTOCOL), pickle.loads, events)
+    _run(
+        "json",
+        lambda items: b"\n".join(json_codec.serialize(item) for item in items),
+        lambda data: [json_codec.deserialize(line) for line in data.split(b"\n")],
+        events,
+    )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import tempfile
+from os import path
+from time import perf_counter
+
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import SqliteEventStore
+
+WALLETS = 1_000
+TRANSACTIONS_PER_WALLET = 20
+
+
+def _prepare_wallets() -> list:
+    wallets = []
+    for _ in range(WALLETS):
+        wallet = Wallet(Money(100))
+        for _ in range(TRANSACTIONS_PER_WALLET):
+            wallet.transact(Money(1))
+        wallets.append((wallet.id, wallet.collect_events()))
+    return wallets
+
+
+def benchmark(batch_size: int) -> None:
+    wallets = _prepare_wallets()
+    total = WALLETS * TRANSACTIONS_PER_WALLET
+    with tempfile.TemporaryDirectory() as directory:
+        with SqliteEventStore(path.join(directory, "events.db"), batch_size=batch_size) as store:
+            start = perf_counter()
+            for wallet_id, events in wallets:
+                store.append(wallet_id, events, expected_version=0)
+            store.flush()
+            append_time = perf_counter() - start
+
+            start = perf_counter()
+            for wallet_id, _ in wallets:
+                store.load(wallet_id)
+            load_time = perf_counter() - start
+
+    print(
+        f"batch_size={batch_size:<6} "
+        f"append: {total / append_time:>10.0f} events/s  "
+        f"load: {total / load_time:>10.0f} events/s"
+    )
+
+
+if __name__ == "__main__":
+    for size in (1, 100, 1_000, 10_000):
+        benchmark(size)
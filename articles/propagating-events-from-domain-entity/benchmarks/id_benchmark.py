@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from time import perf_counter
+from uuid import uuid4
+
+from domain.entity import Id
+
+ENTRIES = 1_000_000
+
+
+def benchmark() -> None:
+    raw = [uuid4() for _ in range(ENTRIES)]
+    strings = [str(value) for value in raw]
+
+    start = perf_counter()
+    ids = [Id.from_bytes(value.bytes) for value in raw]
+    print(f"Id.from_bytes:        {(perf_counter() - start) / ENTRIES * 1e9:>6.0f} ns/id")
+
+    hot = strings[:10_000]
+    for value in hot:
+        Id(value)
+    start = perf_counter()
+    for _ in range(100):
+        for value in hot:
+            Id(value)
+    print(f"Id(str) cached:       {(perf_counter() - start) / (100 * len(hot)) * 1e9:>6.0f} ns/id")
+
+    start = perf_counter()
+    aggregates = {identifier: index for index, identifier in enumerate(ids)}
+    print(f"map build:            {(perf_counter() - start) / ENTRIES * 1e9:>6.0f} ns/entry")
+
+    lookups = [Id.from_uuid(value) for value in raw]
+    start = perf_counter()
+    for identifier in lookups:
+        aggregates[identifier]
+    print(f"map lookup:           {(perf_counter() - start) / ENTRIES * 1e9:>6.0f} ns/lookup")
+
+
+if __name__ == "__main__":
+    benchmark()
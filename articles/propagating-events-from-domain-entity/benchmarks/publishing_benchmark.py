@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from domain import wallet_context_local_publication, wallet_static_publication_mechanism
+from domain.money import Money
+from domain.publishing import publishing
+from domain.wallet_event_bus_injection import InMemoryEventBus
+from domain.wallet_static_publication_mechanism import DummyEventBus, GlobalEventBus
+
+TRANSACTIONS_PER_THREAD = 50_000
+
+
+def _static_worker() -> None:
+    wallet = wallet_static_publication_mechanism.Wallet(Money(100))
+    for _ in range(TRANSACTIONS_PER_THREAD):
+        wallet.transact(Money(1))
+
+
+def _context_local_worker(listening: bool) -> None:
+    wallet = wallet_context_local_publication.Wallet(Money(100))
+    if not listening:
+        for _ in range(TRANSACTIONS_PER_THREAD):
+            wallet.transact(Money(1))
+        return
+    with publishing(InMemoryEventBus()):
+        for _ in range(TRANSACTIONS_PER_THREAD):
+            wallet.transact(Money(1))
+
+
+def _run(name: str, threads: int, worker, *args) -> None:
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(worker, *args) for _ in range(threads)]:
+            future.result()
+    elapsed = perf_counter() - start
+    print(f"{name:<24} threads={threads:<3} {threads * TRANSACTIONS_PER_THREAD / elapsed:>10.0f} transactions/s")
+
+
+def benchmark() -> None:
+    for threads in (1, 2, 4, 8):
+        GlobalEventBus.init(DummyEventBus())
+        _run("GlobalEventBus", threads, _static_worker)
+        _run("publishing()", threads, _context_local_worker, True)
+        _run("publishing() no listener", threads, _context_local_worker, False)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import random
+import tempfile
+from os import cpu_count, path
+
+from application.replay import ReplayEngine
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.codec import BinaryCodec, wallet_registry
+from infrastructure.event_store import SqliteEventStore
+
+WALLETS = 10_000
+TRANSACTIONS_PER_WALLET = 20
+
+
+def benchmark() -> None:
+    random.seed(1)
+    codec = BinaryCodec(wallet_registry())
+    with tempfile.TemporaryDirectory() as directory:
+        with SqliteEventStore(path.join(directory, "events.db"), batch_size=10_000, serializer=codec) as store:
+            for _ in range(WALLETS):
+                wallet = Wallet(Money(100))
+                wallet.transact_many([Money(random.randint(-10, 12)) for _ in range(TRANSACTIONS_PER_WALLET)])
+                store.append(wallet.id, wallet.collect_events(), expected_version=0)
+            store.flush()
+
+            workers = 1
+            while workers <= (cpu_count() or 1) * 2:
+                result = ReplayEngine(store, Money(100), workers=workers).run()
+                progress = result.progress
+                print(
+                    f"workers={workers:<3} {progress.events} events in {progress.elapsed:.2f}s "
+                    f"({progress.events_per_second:.0f} events/s)"
+                )
+                workers *= 2
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from application.rules import RulesEngine, VelocityRule
+from domain.entity import Id
+from domain.money import Money
+from domain.wallet import FundsWithdrawn
+from domain.wallet_event_bus_injection import InMemoryEventBus
+
+WALLETS = 200_000
+EVENTS = 1_000_000
+
+
+def benchmark() -> None:
+    random.seed(1)
+    wallet_ids = [Id() for _ in range(WALLETS)]
+    start_time = datetime(2024, 1, 1)
+    events = []
+    for index in range(EVENTS):
+        event = FundsWithdrawn(random.choice(wallet_ids), Money(-1))
+        event.created_at = start_time + timedelta(milliseconds=index)
+        events.append(event)
+
+    bus = InMemoryEventBus()
+    engine = RulesEngine([VelocityRule("withdrawals_per_minute", limit=5)], bus)
+    tracemalloc.start()
+    start = perf_counter()
+    engine.publish_many(events)
+    elapsed = perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracked = engine.tracked_wallets("withdrawals_per_minute")
+    print(f"{EVENTS / elapsed:>10.0f} events/s, {len(bus.events)} decisions")
+    print(f"{tracked} wallets tracked, {current / max(tracked, 1):.0f} bytes per tracked wallet")
+
+
+if __name__ == "__main__":
+    benchmark()
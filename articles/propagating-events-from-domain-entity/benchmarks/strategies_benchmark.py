@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from domain import (
+    wallet_context_local_publication,
+    wallet_event_as_a_result_of_method_invocation,
+    wallet_event_bus_injection,
+    wallet_internal_event_collection,
+    wallet_static_publication_mechanism,
+)
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.publishing import publishing
+from domain.wallet_static_publication_mechanism import GlobalEventBus
+
+OVERDRAFT_LIMIT = 100
+
+
+class CountingEventBus:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def publish(self, event: DomainEvent) -> None:
+        self.count += 1
+
+    def publish_many(self, events: List[DomainEvent]) -> None:
+        self.count += len(events)
+
+
+def deposit_heavy(rng: random.Random) -> int:
+    return rng.randint(1, 50) if rng.random() < 0.9 else -rng.randint(1, 20)
+
+
+def overdraft_heavy(rng: random.Random) -> int:
+    return -rng.randint(1, 30) if rng.random() < 0.6 else rng.randint(1, 40)
+
+
+def lock_storm(rng: random.Random) -> int:
+    return -rng.randint(60, 150) if rng.random() < 0.5 else rng.randint(1, 20)
+
+
+WORKLOADS: Dict[str, Callable[[random.Random], int]] = {
+    "deposit_heavy": deposit_heavy,
+    "overdraft_heavy": overdraft_heavy,
+    "lock_storm": lock_storm,
+}
+
+
+def _static(amounts: List[Money]) -> int:
+    bus = CountingEventBus()
+    GlobalEventBus.init(bus)
+    wallet = wallet_static_publication_mechanism.Wallet(Money(OVERDRAFT_LIMIT))
+    for amount in amounts:
+        if wallet.locked:
+            wallet = wallet_static_publication_mechanism.Wallet(Money(OVERDRAFT_LIMIT))
+        wallet.transact(amount)
+    return bus.count
+
+
+def _injection(amounts: List[Money]) -> int:
+    bus = CountingEventBus()
+    wallet = wallet_event_bus_injection.Wallet(Money(OVERDRAFT_LIMIT))
+    for amount in amounts:
+        if wallet.locked:
+            wallet = wallet_event_bus_injection.Wallet(Money(OVERDRAFT_LIMIT))
+        wallet.transact(amount, bus)
+    return bus.count
+
+
+def _internal_collection(amounts: List[Money]) -> int:
+    count = 0
+    wallet = wallet_internal_event_collection.Wallet(Money(OVERDRAFT_LIMIT))
+    for amount in amounts:
+        if wallet.locked:
+            wallet = wallet_internal_event_collection.Wallet(Money(OVERDRAFT_LIMIT))
+        wallet.transact(amount)
+        count += len(wallet.collect_events())
+    return count
+
+
+def _method_invocation(amounts: List[Money]) -> int:
+    count = 0
+    wallet = wallet_event_as_a_result_of_method_invocation.Wallet(Money(OVERDRAFT_LIMIT))
+    for amount in amounts:
+        if wallet.locked:
+            wallet = wallet_event_as_a_result_of_method_invocation.Wallet(Money(OVERDRAFT_LIMIT))
+        for _ in wallet.transact(amount):
+            count += 1
+    return count
+
+
+def _context_local(amounts: List[Money]) -> int:
+    bus = CountingEventBus()
+    wallet = wallet_context_local_publication.Wallet(Money(OVERDRAFT_LIMIT))
+    with publishing(bus):
+        for amount in amounts:
+            if wallet.locked:
+                wallet = wallet_context_local_publication.Wallet(Money(OVERDRAFT_LIMIT))
+            wallet.transact(amount)
+    return bus.count
+
+
+STRATEGIES: Dict[str, Callable[[List[Money]], int]] = {
+    "static_publication": _static,
+    "event_bus_injection": _injection,
+    "internal_collection": _internal_collection,
+    "method_invocation": _method_invocation,
+    "context_local_publication": _context_local,
+}
+
+
+def _amounts(workload: str, transactions: int, seed: int) -> List[Money]:
+    rng = random.Random(seed)
+    generate = WORKLOADS[workload]
+    return [Money(generate(rng)) for _ in range(transactions)]
+
+
+def measure(strategy: str, workload: str, transactions: int, threads: List[int]) -> Dict:
+    run = STRATEGIES[strategy]
+    amounts = _amounts(workload, transactions, seed=1)
+
+    start = perf_counter()
+    events = run(amounts)
+    elapsed = perf_counter() - start
+
+    # CPython has no allocation counter, events per transaction and peak traced memory stand in for it.
+    tracemalloc.start()
+    run(amounts)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    scaling = {}
+    for count in threads:
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            for future in [executor.submit(run, amounts) for _ in range(count)]:
+                future.result()
+        scaling[str(count)] = count * transactions / (perf_counter() - start)
+
+    return {
+        "strategy": strategy,
+        "workload": workload,
+        "transactions": transactions,
+        "events": events,
+        "ns_per_transaction": elapsed / transactions * 1e9,
+        "events_per_transaction": events / transactions,
+        "peak_memory_bytes": peak,
+        "retained_memory_bytes": retained,
+        "threaded_transactions_per_second": scaling,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compares event propagation strategies of the Wallet entity.")
+    parser.add_argument("--transactions", type=int, default=50_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), nargs="+", default=list(STRATEGIES))
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), nargs="+", default=list(WORKLOADS))
+    parser.add_argument("--output", default="strategies_benchmark.json")
+    arguments = parser.parse_args()
+
+    results = []
+    for workload in arguments.workload:
+        for strategy in arguments.strategy:
+            result = measure(strategy, workload, arguments.transactions, arguments.threads)
+            results.append(result)
+            print(
+                f"{workload:<16} {strategy:<26} {result['ns_per_transaction']:>8.0f} ns/tx  "
+                f"{result['events_per_transaction']:>5.2f} events/tx  "
+                f"{result['peak_memory_bytes'] / 1024:>8.0f} KiB peak"
+            )
+
+    with open(arguments.output, "w") as file:
+        json.dump({"python": platform.python_version(), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
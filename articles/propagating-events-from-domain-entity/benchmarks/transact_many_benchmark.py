@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import random
+from time import perf_counter
+
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+
+TRANSACTIONS = 200_000
+
+
+def benchmark() -> None:
+    random.seed(1)
+    amounts = [Money(random.randint(-10, 12)) for _ in range(TRANSACTIONS)]
+
+    wallet = Wallet(Money(1_000_000))
+    start = perf_counter()
+    for amount in amounts:
+        wallet.transact(amount)
+    sequential_time = perf_counter() - start
+
+    bulk_wallet = Wallet(Money(1_000_000))
+    start = perf_counter()
+    bulk_wallet.transact_many(amounts)
+    bulk_time = perf_counter() - start
+
+    assert bulk_wallet.balance.value == wallet.balance.value
+    print(f"transact loop: {sequential_time / TRANSACTIONS * 1e9:>8.0f} ns/transaction")
+    print(f"transact_many: {bulk_time / TRANSACTIONS * 1e9:>8.0f} ns/transaction")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import random
+from os import cpu_count
+from time import perf_counter
+from typing import Optional
+
+from application.wallet_processor import ShardedWalletProcessor
+from domain.entity import Id
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+
+WALLETS = 100_000
+TRANSACTIONS = 500_000
+
+
+class NewWallets:
+    def get(self, wallet_id: Id) -> Optional[Wallet]:
+        return None
+
+
+def benchmark() -> None:
+    random.seed(1)
+    wallet_ids = [Id() for _ in range(WALLETS)]
+    transactions = [(random.choice(wallet_ids), Money(random.randint(-10, 12))) for _ in range(TRANSACTIONS)]
+
+    workers = 1
+    while workers <= (cpu_count() or 1) * 2:
+        processor = ShardedWalletProcessor(NewWallets(), Money(50), workers=workers)
+        start = perf_counter()
+        processor.process(transactions)
+        elapsed = perf_counter() - start
+        print(f"workers={workers:<3} {TRANSACTIONS / elapsed:>10.0f} transactions/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from threading import Lock
+from time import monotonic, perf_counter, sleep
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+
+from domain.event import DomainEvent
+
+Handler = Callable[[DomainEvent], None]
+
+# Upper bounds of latency buckets in seconds, the last bucket catches everything above.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+@dataclass
+class LatencyHistogram:
+    counts: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    total: float = 0.0
+    failures: int = 0
+    retries: int = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, fraction: float) -> float:
+        threshold = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if count and seen >= threshold:
+                return bound
+        return 0.0
+
+
+class ProcessedEvents:
+    def __init__(self, max_size: int = 100_000, ttl: float = 3600.0, clock: Callable[[], float] = monotonic) -> None:
+        self._entries: OrderedDict[Tuple[UUID, str], float] = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+
+    def claim(self, event_id: UUID, handler_name: str) -> bool:
+        key = (event_id, handler_name)
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            if key in self._entries:
+                return False
+            self._entries[key] = now + self._ttl
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+            return True
+
+    def release(self, event_id: UUID, handler_name: str) -> None:
+        with self._lock:
+            self._entries.pop((event_id, handler_name), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            key, expires_at = next(iter(self._entries.items()))
+            if expires_at > now:
+                return
+            del self._entries[key]
+
+
+class EventDispatcher:
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.05,
+        processed: Optional[ProcessedEvents] = None,
+        sleep: Callable[[float], None] = sleep,
+    ) -> None:
+        self._handlers: Dict[Type[DomainEvent], List[Tuple[str, Handler]]] = defaultdict(list)
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._subscribers: Dict[str, Handler] = {}
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._processed = processed or ProcessedEvents()
+        self._sleep = sleep
+        self._metrics_lock = Lock()
+        self.metrics: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    def subscribe(self, event_class: Type[DomainEvent], handler: Handler, name: str = "", workers: int = 1) -> str:
+        # The name keys idempotency and the worker pool, so it must never be shared by two handlers.
+        if not name:
+            name = base = getattr(handler, "__qualname__", repr(handler))
+            suffix = 1
+            while self._subscribers.get(name, handler) != handler:
+                suffix += 1
+                name = f"{base}#{suffix}"
+        elif self._subscribers.get(name, handler) != handler:
+            raise ValueError(f"Handler name `{name}` is already used by another handler")
+
+        if name not in self._subscribers:
+            self._subscribers[name] = handler
+            # Every handler owns its pool, a slow handler can only exhaust its own workers.
+            self._executors[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._handlers[event_class].append((name, handler))
+        return name
+
+    def handlers_for(self, event: DomainEvent) -> List[Tuple[str, Handler]]:
+        return [
+            handler
+            for event_class in type(event).__mro__
+            if event_class in self._handlers
+            for handler in self._handlers[event_class]
+        ]
+
+    def publish(self, event: DomainEvent) -> List[Future]:
+        return [
+            self._executors[name].submit(self._run, name, handler, event)
+            for name, handler in self.handlers_for(event)
+            if self._processed.claim(event.id, name)
+        ]
+
+    def publish_many(self, events: List[DomainEvent]) -> List[Future]:
+        return [future for event in events for future in self.publish(event)]
+
+    def drain(self, futures: List[Future], timeout: Optional[float] = None) -> None:
+        wait(futures, timeout)
+
+    def shutdown(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+    def _run(self, name: str, handler: Handler, event: DomainEvent) -> None:
+        for attempt in range(1, self._max_attempts + 1):
+            start = perf_counter()
+            try:
+                handler(event)
+            except Exception:
+                self._record(name, perf_counter() - start, failed=True, retried=attempt < self._max_attempts)
+                if attempt == self._max_attempts:
+                    self._processed.release(event.id, name)
+                    raise
+                self._sleep(self._base_delay * 2 ** (attempt - 1))
+            else:
+                self._record(name, perf_counter() - start)
+                return
+
+    def _record(self, name: str, seconds: float, failed: bool = False, retried: bool = False) -> None:
+        with self._metrics_lock:
+            histogram = self.metrics[name]
+            histogram.observe(seconds)
+            histogram.failures += failed
+            histogram.retries += retried
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Protocol, Set, Tuple, Type
+from uuid import UUID
+
+from domain.entity import Id
+from domain.event import DomainEvent
+from domain.money import Amount
+from domain.wallet import FundsDeposited, FundsWithdrawn
+from infrastructure.event_store import EventSerializer, SqliteEventStore
+
+
+class Projection(Protocol):
+    @abstractmethod
+    def apply(self, event: DomainEvent) -> None:
+        ...
+
+    @abstractmethod
+    def merge(self, other: Projection) -> None:
+        ...
+
+    @abstractmethod
+    def reset(self) -> None:
+        ...
+
+
+class DepositTotals:
+    def __init__(self) -> None:
+        self._totals: Dict[UUID, Amount] = defaultdict(int)
+
+    def apply(self, event: DomainEvent) -> None:
+        if isinstance(event, FundsDeposited):
+            self._totals[event.wallet_id.value] += event.amount.value
+
+    def merge(self, other: DepositTotals) -> None:
+        for key, total in other._totals.items():
+            self._totals[key] += total
+
+    def reset(self) -> None:
+        self._totals.clear()
+
+    def total(self, wallet_id: Id) -> Amount:
+        return self._totals.get(wallet_id.value, 0)
+
+
+class OverdrawnWallets:
+    def __init__(self) -> None:
+        self._balances: Dict[UUID, Amount] = defaultdict(int)
+        self._overdrawn: Set[UUID] = set()
+
+    def apply(self, event: DomainEvent) -> None:
+        if isinstance(event, (FundsDeposited, FundsWithdrawn)):
+            key = event.wallet_id.value
+            self._balances[key] += event.amount.value
+            self._update(key)
+
+    def merge(self, other: OverdrawnWallets) -> None:
+        for key, balance in other._balances.items():
+            self._balances[key] += balance
+            self._update(key)
+
+    def reset(self) -> None:
+        self._balances.clear()
+        self._overdrawn.clear()
+
+    def is_overdrawn(self, wallet_id: Id) -> bool:
+        return wallet_id.value in self._overdrawn
+
+    def overdrawn(self) -> Set[UUID]:
+        return set(self._overdrawn)
+
+    def _update(self, key: UUID) -> None:
+        if self._balances[key] < 0:
+            self._overdrawn.add(key)
+        else:
+            self._overdrawn.discard(key)
+
+
+def _fold_range(
+    path: str,
+    serializer: EventSerializer,
+    projection_types: List[Type[Projection]],
+    after_position: int,
+    until_position: int,
+) -> List[Projection]:
+    projections = [projection_type() for projection_type in projection_types]
+    with SqliteEventStore(path, serializer=serializer) as store:
+        for _, event in store.read_all(after_position, until_position):
+            for projection in projections:
+                projection.apply(event)
+    return projections
+
+
+class ProjectionEngine:
+    def __init__(self, store: SqliteEventStore, *projections: Projection) -> None:
+        self._store = store
+        self.projections = list(projections)
+        self.position = 0
+
+    def publish(self, event: DomainEvent) -> None:
+        # Live subscription, for events that do not go through the store.
+        for projection in self.projections:
+            projection.apply(event)
+
+    def catch_up(self, batch_size: int = 1_000) -> int:
+        processed = 0
+        while True:
+            batch = self._store.read_all(self.position, limit=batch_size)
+            if not batch:
+                return processed
+            for position, event in batch:
+                for projection in self.projections:
+                    projection.apply(event)
+            self.position = batch[-1][0]
+            processed += len(batch)
+
+    def rebuild(self, workers: int = 4, batch_size: int = 10_000) -> int:
+        last_position = self._store.last_position()
+        projection_types = [type(projection) for projection in self.projections]
+        # Callers keep references to their projections, they are rebuilt in place.
+        for projection in self.projections:
+            projection.reset()
+        self.position = 0
+        if self._store.path == ":memory:" or workers == 1:
+            self.catch_up(batch_size)
+            return self.position
+
+        ranges: List[Tuple[int, int]] = [
+            (start, min(start + batch_size, last_position)) for start in range(0, last_position, batch_size)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_fold_range, self._store.path, self._store.serializer, projection_types, start, end)
+                for start, end in ranges
+            ]
+            for future in futures:
+                for projection, partial in zip(self.projections, future.result()):
+                    projection.merge(partial)
+
+        self.position = last_position
+        return self.position
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+
+from application.projections import Projection
+from domain.entity import Id
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import EventSerializer, SqliteEventStore
+
+
+@dataclass
+class ReplayProgress:
+    partitions: int
+    completed_partitions: int = 0
+    aggregates: int = 0
+    events: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class ReplayResult:
+    wallets: Dict[UUID, Wallet] = field(default_factory=dict)
+    projections: List[Projection] = field(default_factory=list)
+    progress: Optional[ReplayProgress] = None
+
+
+def _replay_partition(
+    path: str,
+    serializer: EventSerializer,
+    aggregate_ids: List[bytes],
+    overdraft_limit: Money,
+    projection_types: List[Type[Projection]],
+) -> Tuple[Dict[UUID, Wallet], List[Projection], int]:
+    with SqliteEventStore(path, serializer=serializer) as store:
+        return _replay(store, aggregate_ids, overdraft_limit, projection_types)
+
+
+def _replay(
+    store: SqliteEventStore,
+    aggregate_ids: List[bytes],
+    overdraft_limit: Money,
+    projection_types: List[Type[Projection]],
+) -> Tuple[Dict[UUID, Wallet], List[Projection], int]:
+    wallets: Dict[UUID, Wallet] = {}
+    projections = [projection_type() for projection_type in projection_types]
+    events_count = 0
+    for aggregate_id in aggregate_ids:
+        wallet_id = Id.from_bytes(aggregate_id)
+        wallet = Wallet.restore(wallet_id, Money(0, overdraft_limit.currency), overdraft_limit, False)
+        for event in store.load(wallet_id):
+            wallet.apply(event)
+            for projection in projections:
+                projection.apply(event)
+            events_count += 1
+        wallets[wallet_id.value] = wallet
+    return wallets, projections, events_count
+
+
+class ReplayEngine:
+    def __init__(
+        self,
+        store: SqliteEventStore,
+        overdraft_limit: Money,
+        projection_types: Optional[List[Type[Projection]]] = None,
+        workers: int = 4,
+        partitions_per_worker: int = 4,
+        on_progress: Optional[Callable[[ReplayProgress], None]] = None,
+    ) -> None:
+        self._store = store
+        self._overdraft_limit = overdraft_limit
+        self._projection_types = projection_types or []
+        self._workers = workers
+        self._partitions_per_worker = partitions_per_worker
+        self._on_progress = on_progress
+
+    def partition(self) -> List[List[bytes]]:
+        count = max(self._workers * self._partitions_per_worker, 1)
+        partitions: List[List[bytes]] = [[] for _ in range(count)]
+        for aggregate_id in self._store.aggregate_ids():
+            partitions[int.from_bytes(aggregate_id, "big") % count].append(aggregate_id)
+        return [partition for partition in partitions if partition]
+
+    def run(self) -> ReplayResult:
+        start = perf_counter()
+        partitions = self.partition()
+        result = ReplayResult(projections=[projection_type() for projection_type in self._projection_types])
+        progress = ReplayProgress(len(partitions))
+        result.progress = progress
+
+        def merge(partial: Tuple[Dict[UUID, Wallet], List[Projection], int]) -> None:
+            wallets, projections, events_count = partial
+            result.wallets.update(wallets)
+            for projection, partial_projection in zip(result.projections, projections):
+                projection.merge(partial_projection)
+            progress.completed_partitions += 1
+            progress.aggregates += len(wallets)
+            progress.events += events_count
+            progress.elapsed = perf_counter() - start
+            if self._on_progress:
+                self._on_progress(progress)
+
+        if self._store.path == ":memory:" or self._workers == 1:
+            for aggregate_ids in partitions:
+                merge(_replay(self._store, aggregate_ids, self._overdraft_limit, self._projection_types))
+            return result
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            futures = [
+                executor.submit(
+                    _replay_partition,
+                    self._store.path,
+                    self._store.serializer,
+                    aggregate_ids,
+                    self._overdraft_limit,
+                    self._projection_types,
+                )
+                for aggregate_ids in partitions
+            ]
+            for future in as_completed(futures):
+                merge(future.result())
+
+        return result
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Type
+from uuid import UUID
+
+from domain.entity import Id
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.wallet import FundsWithdrawn
+from domain.wallet_event_bus_injection import EventBus
+
+
+class VelocityLimitExceeded(DomainEvent):
+    def __init__(self, wallet_id: Id, amount: Money, rule: str, count: int):
+        self.wallet_id = wallet_id
+        self.amount = amount
+        self.rule = rule
+        self.count = count
+        super().__init__()
+
+    @property
+    def namespace(self) -> str:
+        return "wallet"
+
+
+@dataclass(frozen=True)
+class VelocityRule:
+    name: str
+    limit: int
+    window: float = 60.0
+    buckets: int = 60
+    event_types: Tuple[Type[DomainEvent], ...] = (FundsWithdrawn,)
+
+    @property
+    def resolution(self) -> float:
+        return self.window / self.buckets
+
+
+class SlidingWindow:
+    __slots__ = ("counts", "total", "head", "tripped")
+
+    def __init__(self, buckets: int, head: int) -> None:
+        self.counts = array("I", bytes(4 * buckets))
+        self.total = 0
+        self.head = head
+        self.tripped = False
+
+    def add(self, bucket: int) -> int:
+        size = len(self.counts)
+        if bucket > self.head:
+            # Buckets that fell out of the window are cleared, at most one full turn of the ring.
+            for expired in range(self.head + 1, min(bucket, self.head + size) + 1):
+                index = expired % size
+                self.total -= self.counts[index]
+                self.counts[index] = 0
+            self.head = bucket
+        elif bucket <= self.head - size:
+            return self.total
+        self.counts[bucket % size] += 1
+        self.total += 1
+        return self.total
+
+
+class RulesEngine:
+    def __init__(self, rules: List[VelocityRule], event_bus: EventBus, max_wallets: int = 1_000_000) -> None:
+        names = [rule.name for rule in rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Rule names must be unique, got duplicates: {', '.join(duplicates)}")
+        self._rules = rules
+        self._event_bus = event_bus
+        self._max_wallets = max_wallets
+        self._windows: Dict[str, OrderedDict[UUID, SlidingWindow]] = {rule.name: OrderedDict() for rule in rules}
+        self._watched = tuple({event_type for rule in rules for event_type in rule.event_types})
+
+    def tracked_wallets(self, rule: str) -> int:
+        return len(self._windows[rule])
+
+    def publish(self, event: DomainEvent) -> None:
+        if not isinstance(event, self._watched):
+            return
+        timestamp = event.created_at.timestamp()
+        for rule in self._rules:
+            if isinstance(event, rule.event_types):
+                self._evaluate(rule, event, timestamp)
+
+    def publish_many(self, events: List[DomainEvent]) -> None:
+        for event in events:
+            self.publish(event)
+
+    def _evaluate(self, rule: VelocityRule, event: DomainEvent, timestamp: float) -> None:
+        windows = self._windows[rule.name]
+        bucket = int(timestamp / rule.resolution)
+        key = event.wallet_id.value
+        window = windows.get(key)
+        if window is None:
+            window = windows[key] = SlidingWindow(rule.buckets, bucket)
+        else:
+            windows.move_to_end(key)
+
+        count = window.add(bucket)
+        if count > rule.limit and not window.tripped:
+            window.tripped = True
+            self._event_bus.publish(VelocityLimitExceeded(event.wallet_id, event.amount, rule.name, count))
+        elif count <= rule.limit:
+            window.tripped = False
+
+        self._expire(windows, bucket - rule.buckets)
+
+    def _expire(self, windows: OrderedDict[UUID, SlidingWindow], oldest_bucket: int) -> None:
+        # Least recently active wallets come first, their windows are empty once the head left the window.
+        while windows:
+            key, window = next(iter(windows.items()))
+            if window.head > oldest_bucket and len(windows) <= self._max_wallets:
+                return
+            del windows[key]
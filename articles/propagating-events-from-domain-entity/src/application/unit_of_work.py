@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from contextlib import AbstractContextManager
+from typing import Dict, List, Optional
+
+from domain.entity import Entity, Id
+from domain.event import DomainEvent
+from domain.tracking import tracking
+from domain.wallet_event_bus_injection import EventBus
+from infrastructure.wallet_store import SqliteWalletStore
+
+
+class UnitOfWork:
+    def __init__(self, store: SqliteWalletStore, event_bus: Optional[EventBus] = None) -> None:
+        self._store = store
+        self._event_bus = event_bus
+        self._scope: Optional[AbstractContextManager] = None
+        self.touched: Dict[Id, Entity] = {}
+        self.published: List[DomainEvent] = []
+
+    def __enter__(self) -> UnitOfWork:
+        self._scope = tracking()
+        self.touched = self._scope.__enter__()
+        return self
+
+    def __exit__(self, error_type, error, traceback) -> None:
+        self._scope.__exit__(error_type, error, traceback)
+        self._scope = None
+        if error_type is None:
+            self.commit()
+
+    def commit(self) -> None:
+        wallets = list(self.touched.values())
+        self.touched = {}
+        if not wallets:
+            return
+
+        collected = [wallet.collect_events() for wallet in wallets]
+        events = [event for wallet_events in collected for event in wallet_events]
+        try:
+            self._store.save_all(wallets, events)
+        except Exception:
+            # A failed save hands the events back to their aggregates for a retry.
+            for wallet, wallet_events in zip(wallets, collected):
+                wallet.requeue_events(wallet_events)
+            raise
+        self.published = events
+        if self._event_bus is None:
+            return
+        publish_many = getattr(self._event_bus, "publish_many", None)
+        if publish_many:
+            publish_many(events)
+            return
+        for event in events:
+            self._event_bus.publish(event)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Literal, Optional, Protocol, Tuple
+from uuid import UUID
+
+from domain.entity import Id
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+
+Transaction = Tuple[Id, Money]
+
+
+class WalletSource(Protocol):
+    @abstractmethod
+    def get(self, wallet_id: Id) -> Optional[Wallet]:
+        ...
+
+
+@dataclass
+class ShardResult:
+    shard: int
+    wallets: Dict[UUID, Wallet] = field(default_factory=dict)
+    events: List[DomainEvent] = field(default_factory=list)
+    processed: int = 0
+    rejected: int = 0
+
+
+def shard_for(wallet_id: Id, shards: int) -> int:
+    return wallet_id.value.int % shards
+
+
+def process_shard(
+    shard: int, wallets: Dict[UUID, Wallet], transactions: List[Transaction], overdraft_limit: Money
+) -> ShardResult:
+    result = ShardResult(shard)
+    amounts_by_wallet: Dict[UUID, List[Money]] = defaultdict(list)
+    ids: Dict[UUID, Id] = {}
+    for wallet_id, amount in transactions:
+        amounts_by_wallet[wallet_id.value].append(amount)
+        ids[wallet_id.value] = wallet_id
+
+    for key, amounts in amounts_by_wallet.items():
+        wallet = wallets.get(key) or Wallet(overdraft_limit, ids[key])
+        applied = wallet.transact_many(amounts) if not wallet.locked else 0
+        result.wallets[key] = wallet
+        result.events.extend(wallet.collect_events())
+        result.processed += applied
+        result.rejected += len(amounts) - applied
+
+    return result
+
+
+class ShardedWalletProcessor:
+    def __init__(
+        self,
+        wallets: WalletSource,
+        overdraft_limit: Money,
+        workers: int = 4,
+        executor: Literal["thread", "process"] = "process",
+    ) -> None:
+        self._wallets = wallets
+        self._overdraft_limit = overdraft_limit
+        self._workers = workers
+        self._executor = executor
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def partition(self, transactions: Iterable[Transaction]) -> List[List[Transaction]]:
+        shards: List[List[Transaction]] = [[] for _ in range(self._workers)]
+        for transaction in transactions:
+            shards[shard_for(transaction[0], self._workers)].append(transaction)
+        return shards
+
+    def process(self, transactions: Iterable[Transaction]) -> List[ShardResult]:
+        shards = self.partition(transactions)
+        # Existing aggregates are loaded here, shards only receive wallets they own.
+        wallets = [self._load(shard_transactions) for shard_transactions in shards]
+        if self._workers == 1:
+            return [process_shard(0, wallets[0], shards[0], self._overdraft_limit)]
+
+        with self._create_executor() as executor:
+            futures = [
+                executor.submit(process_shard, shard, wallets[shard], shard_transactions, self._overdraft_limit)
+                for shard, shard_transactions in enumerate(shards)
+            ]
+            return [future.result() for future in futures]
+
+    def _load(self, transactions: List[Transaction]) -> Dict[UUID, Wallet]:
+        wallets: Dict[UUID, Optional[Wallet]] = {}
+        for wallet_id, _ in transactions:
+            if wallet_id.value not in wallets:
+                wallets[wallet_id.value] = self._wallets.get(wallet_id)
+        return {key: wallet for key, wallet in wallets.items() if wallet is not None}
+
+    def _create_executor(self) -> Executor:
+        if self._executor == "thread":
+            return ThreadPoolExecutor(max_workers=self._workers)
+        return ProcessPoolExecutor(max_workers=self._workers)
@@ -1,15 +1,59 @@
-from uuid import UUID
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional, Union
+from uuid import UUID, SafeUUID, uuid4
+
+_UUID_SAFETY_UNKNOWN = SafeUUID.unknown
+
+
+@lru_cache(maxsize=65_536)
+def _parse(value: str) -> UUID:
+    return UUID(value, version=4)
 
 
 class Id:
+    __slots__ = ("value", "_hash")
+
     def __init__(self, value: str = "") -> None:
-        if value:
-            self.value = UUID(value, version=4)
+        self.value = _parse(value) if value else uuid4()
+        self._hash = hash(self.value.int)
+
+    @classmethod
+    def from_uuid(cls, value: UUID) -> Id:
+        instance = cls.__new__(cls)
+        instance.value = value
+        instance._hash = hash(value.int)
+        return instance
+
+    @classmethod
+    def from_bytes(cls, value: Union[bytes, bytearray, memoryview]) -> Id:
+        if len(value) != 16:
+            raise ValueError(f"Id requires exactly 16 bytes, got: {len(value)}")
+        # Skips the argument validation of UUID.__init__, the same way UUID is unpickled.
+        uuid = object.__new__(UUID)
+        object.__setattr__(uuid, "int", int.from_bytes(value, "big"))
+        object.__setattr__(uuid, "is_safe", _UUID_SAFETY_UNKNOWN)
+        return cls.from_uuid(uuid)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Id):
+            return NotImplemented
+        return self.value.int == other.value.int
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        return f"Id('{self.value}')"
 
 
 class Entity:
-    def __init__(self):
-        self._id = Id()
+    def __init__(self, entity_id: Optional[Id] = None):
+        self._id = entity_id or Id()
 
     @property
     def id(self) -> Id:
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Tuple, Type
+
+from domain.entity import Id
+from domain.event import DomainEvent
+
+EventDescriptor = Tuple[Type[DomainEvent], Id, Any]
+
+
+class EventStream:
+    __slots__ = ("_descriptors", "_events")
+
+    def __init__(self) -> None:
+        self._descriptors: List[EventDescriptor] = []
+        self._events: Dict[int, DomainEvent] = {}
+
+    def record(self, event_class: Type[DomainEvent], wallet_id: Id, amount: Any) -> None:
+        self._descriptors.append((event_class, wallet_id, amount))
+
+    def types(self) -> List[Type[DomainEvent]]:
+        return [descriptor[0] for descriptor in self._descriptors]
+
+    def of_type(self, *event_classes: Type[DomainEvent]) -> Iterator[DomainEvent]:
+        for index, descriptor in enumerate(self._descriptors):
+            if issubclass(descriptor[0], event_classes):
+                yield self[index]
+
+    def __getitem__(self, index: int) -> DomainEvent:
+        index = index + len(self._descriptors) if index < 0 else index
+        if index not in self._events:
+            # Events get their id and timestamp when they are read for the first time.
+            event_class, wallet_id, amount = self._descriptors[index]
+            self._events[index] = event_class(wallet_id, amount)
+        return self._events[index]
+
+    def __iter__(self) -> Iterator[DomainEvent]:
+        for index in range(len(self._descriptors)):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return len(self._descriptors)
+
+    def __bool__(self) -> bool:
+        return bool(self._descriptors)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from domain.event import DomainEvent
+from domain.wallet_event_bus_injection import EventBus
+
+_buffer: ContextVar[Optional[List[DomainEvent]]] = ContextVar("domain_event_buffer", default=None)
+
+
+def publish(event: DomainEvent) -> None:
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer.append(event)
+
+
+def is_publishing() -> bool:
+    return _buffer.get() is not None
+
+
+@contextmanager
+def publishing(event_bus: EventBus) -> Iterator[List[DomainEvent]]:
+    buffer: List[DomainEvent] = []
+    token = _buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _buffer.reset(token)
+
+    # Reached only when the block succeeded, events of a failed block are dropped.
+    publish_many = getattr(event_bus, "publish_many", None)
+    if publish_many:
+        publish_many(buffer)
+        return
+    for event in buffer:
+        event_bus.publish(event)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from domain.entity import Entity, Id
+
+_touched: ContextVar[Optional[Dict[Id, Entity]]] = ContextVar("touched_entities", default=None)
+
+
+def track(entity: Entity) -> None:
+    touched = _touched.get()
+    if touched is not None and entity.id not in touched:
+        touched[entity.id] = entity
+
+
+@contextmanager
+def tracking() -> Iterator[Dict[Id, Entity]]:
+    touched: Dict[Id, Entity] = {}
+    token = _touched.set(touched)
+    try:
+        yield touched
+    finally:
+        _touched.reset(token)
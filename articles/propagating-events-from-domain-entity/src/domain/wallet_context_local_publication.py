@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from domain.entity import Entity
+from domain.money import Money
+from domain.publishing import publish
+from domain.wallet import FundsDeposited, FundsWithdrawn, OverdraftLimitHit, WalletLocked, OverdraftOccurred
+
+
+class Wallet(Entity):
+    def __init__(self, overdraft_limit: Money) -> None:
+        self.balance = Money(0)
+        self.overdraft_limit = overdraft_limit
+        self.locked = False
+        super().__init__()
+
+    def transact(self, amount: Money) -> None:
+        if self.locked:
+            raise Exception("Wallet is locked, transactions are not possible")
+
+        if amount > 0:
+            self.balance += amount
+            publish(FundsDeposited(self.id, amount))
+            return
+
+        if amount < 0:
+            if self.balance + amount < -self.overdraft_limit:
+                self.balance += amount
+                publish(FundsWithdrawn(self.id, amount))
+                publish(OverdraftOccurred(self.id, amount))
+                publish(OverdraftLimitHit(self.id, amount))
+                self.lock_wallet()
+            else:
+                self.balance += amount
+                publish(FundsWithdrawn(self.id, amount))
+                if self.balance < 0:
+                    publish(OverdraftOccurred(self.id, amount))
+
+    def lock_wallet(self) -> None:
+        self.locked = True
+        publish(WalletLocked(self.id, self.balance))
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from typing import Iterator
+from typing import Optional
 
 from domain.entity import Entity
-from domain.event import DomainEvent
+from domain.event_stream import EventStream
 from domain.money import Money
 from domain.wallet import FundsDeposited, FundsWithdrawn, OverdraftLimitHit, WalletLocked, OverdraftOccurred
 
@@ -15,29 +15,33 @@ class Wallet(Entity):
         self.locked = False
         super().__init__()
 
-    def transact(self, amount: Money) -> Iterator[DomainEvent]:
+    def transact(self, amount: Money) -> EventStream:
         if self.locked:
             raise Exception("Wallet is locked, transactions are not possible")
 
+        events = EventStream()
         if amount > 0:
             self.balance += amount
-            yield FundsDeposited(self.id, amount)
-            return
+            events.record(FundsDeposited, self.id, amount)
+            return events
 
         if amount < 0:
             if self.balance + amount < -self.overdraft_limit:
                 self.balance += amount
-                yield FundsWithdrawn(self.id, amount)
-                yield OverdraftOccurred(self.id, amount)
-                yield OverdraftLimitHit(self.id, amount)
-                for event in self.lock_wallet():
-                    yield event
+                events.record(FundsWithdrawn, self.id, amount)
+                events.record(OverdraftOccurred, self.id, amount)
+                events.record(OverdraftLimitHit, self.id, amount)
+                self.lock_wallet(events)
             else:
                 self.balance += amount
-                yield FundsWithdrawn(self.id, amount)
+                events.record(FundsWithdrawn, self.id, amount)
                 if self.balance < 0:
-                    yield OverdraftOccurred(self.id, amount)
+                    events.record(OverdraftOccurred, self.id, amount)
 
-    def lock_wallet(self) -> Iterator[DomainEvent]:
+        return events
+
+    def lock_wallet(self, events: Optional[EventStream] = None) -> EventStream:
+        events = EventStream() if events is None else events
         self.locked = True
-        yield WalletLocked(self.id, self.balance)
+        events.record(WalletLocked, self.id, self.balance)
+        return events
@@ -1,29 +1,41 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Iterable, List, Optional
 
-from domain.entity import Entity
+from domain.entity import Entity, Id
 from domain.event import DomainEvent
 from domain.money import Money
+from domain.tracking import track
 from domain.wallet import FundsDeposited, FundsWithdrawn, OverdraftLimitHit, WalletLocked, OverdraftOccurred
 
 
 class Wallet(Entity):
-    def __init__(self, overdraft_limit: Money) -> None:
+    def __init__(self, overdraft_limit: Money, wallet_id: Optional[Id] = None) -> None:
         self.balance = Money(0)
         self.overdraft_limit = overdraft_limit
         self.locked = False
         self._events = []
-        super().__init__()
+        super().__init__(wallet_id)
+
+    @classmethod
+    def restore(cls, wallet_id: Id, balance: Money, overdraft_limit: Money, locked: bool) -> Wallet:
+        wallet = cls(overdraft_limit, wallet_id)
+        wallet.balance = balance
+        wallet.locked = locked
+        return wallet
 
     def _record_event(self, event: DomainEvent):
+        track(self)
         self._events.append(event)
 
     def collect_events(self) -> List[DomainEvent]:
-        events = self._events[:]
-        self._events = []
+        events, self._events = self._events, []
         return events
 
+    def requeue_events(self, events: List[DomainEvent]) -> None:
+        # Collected events that could not be committed go back ahead of anything recorded since.
+        self._events[:0] = events
+
     def transact(self, amount: Money) -> None:
         if self.locked:
             raise Exception("Wallet is locked, transactions are not possible")
@@ -49,3 +61,66 @@ class Wallet(Entity):
     def lock_wallet(self) -> None:
         self.locked = True
         self._record_event(WalletLocked(self.id, self.balance))
+
+    def apply(self, event: DomainEvent) -> None:
+        # Rebuilds state from an already recorded event, nothing new is recorded.
+        if isinstance(event, (FundsDeposited, FundsWithdrawn)):
+            self.balance += event.amount
+        elif isinstance(event, WalletLocked):
+            self.locked = True
+
+    def transact_many(self, amounts: Iterable[Money]) -> int:
+        # Same outcome as calling `transact` for each amount, but the balance is kept as a running
+        # sum of raw values and events are materialised once, after the last applied amount.
+        balance = self.balance.value
+        currency = self.balance.currency
+        floor = -self.overdraft_limit.value
+        limit_currency = self.overdraft_limit.currency
+        descriptors = []
+        record = descriptors.append
+        applied = 0
+        locked = self.locked
+        try:
+            for amount in amounts:
+                if locked:
+                    raise Exception("Wallet is locked, transactions are not possible")
+
+                value = amount.value if isinstance(amount, Money) else amount
+                if not value:
+                    # `transact` ignores zero amounts before money of different currencies is ever added.
+                    applied += 1
+                    continue
+                if isinstance(amount, Money) and amount.currency != currency:
+                    raise ValueError("Currencies mismatch")
+
+                if value < 0:
+                    if limit_currency != currency:
+                        raise ValueError("Currencies mismatch")
+                    balance += value
+                    record((FundsWithdrawn, amount))
+                    if balance < floor:
+                        record((OverdraftOccurred, amount))
+                        record((OverdraftLimitHit, amount))
+                        record((WalletLocked, None))
+                        locked = True
+                        applied += 1
+                        break
+                    if balance < 0:
+                        record((OverdraftOccurred, amount))
+                elif value > 0:
+                    balance += value
+                    record((FundsDeposited, amount))
+                applied += 1
+        finally:
+            if applied:
+                if descriptors:
+                    track(self)
+                self.balance = Money(balance, currency)
+                self.locked = locked
+                wallet_id = self.id
+                self._events.extend(
+                    event_class(wallet_id, self.balance if amount is None else amount)
+                    for event_class, amount in descriptors
+                )
+
+        return applied
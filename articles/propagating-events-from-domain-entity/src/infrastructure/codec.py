@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Type, Union
+from uuid import UUID
+
+from domain.entity import Id
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.wallet import FundsDeposited, FundsWithdrawn, OverdraftLimitHit, OverdraftOccurred, WalletLocked
+
+FieldKind = Literal["id", "money", "int", "str"]
+Buffer = Union[bytes, bytearray, memoryview]
+
+_EPOCH = datetime(1970, 1, 1)
+_AMOUNT_INT = 0
+_AMOUNT_DECIMAL = 1
+_AMOUNT_FLOAT = 2
+_float = struct.Struct("<d")
+
+
+class CodecError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class EventSchema:
+    event_class: Type[DomainEvent]
+    type_id: int
+    version: int
+    fields: Tuple[Tuple[str, FieldKind], ...]
+    upcast: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+
+
+class SchemaRegistry:
+    def __init__(self) -> None:
+        self._by_class: Dict[Type[DomainEvent], EventSchema] = {}
+        self._by_type: Dict[Tuple[int, int], EventSchema] = {}
+        self._by_name: Dict[str, EventSchema] = {}
+
+    def register(
+        self,
+        event_class: Type[DomainEvent],
+        type_id: int,
+        fields: List[Tuple[str, FieldKind]],
+        version: int = 1,
+        upcast: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> EventSchema:
+        if (type_id, version) in self._by_type:
+            raise CodecError(f"Schema {type_id} v{version} is already registered")
+        current = self._by_class.get(event_class)
+        if current and current.type_id != type_id:
+            raise CodecError(f"Event `{event_class.__name__}` is already registered as type {current.type_id}")
+
+        schema = EventSchema(event_class, type_id, version, tuple(fields), upcast)
+        self._by_type[(type_id, version)] = schema
+        if not current or current.version < version:
+            self._by_class[event_class] = schema
+            self._by_name[event_class.__name__] = schema
+        return schema
+
+    def for_event(self, event: DomainEvent) -> EventSchema:
+        try:
+            return self._by_class[event.__class__]
+        except KeyError:
+            raise CodecError(f"No schema registered for `{event.__class__.__name__}`") from None
+
+    def for_type(self, type_id: int, version: int) -> EventSchema:
+        try:
+            return self._by_type[(type_id, version)]
+        except KeyError:
+            raise CodecError(f"Unknown schema {type_id} v{version}") from None
+
+    def for_name(self, name: str) -> EventSchema:
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise CodecError(f"Unknown event `{name}`") from None
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: memoryview, offset: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_str(buffer: bytearray, value: str) -> None:
+    encoded = value.encode()
+    _write_varint(buffer, len(encoded))
+    buffer += encoded
+
+
+def _read_str(data: memoryview, offset: int) -> Tuple[str, int]:
+    length, offset = _read_varint(data, offset)
+    return str(data[offset:offset + length], "utf-8"), offset + length
+
+
+def _write_money(buffer: bytearray, money: Money) -> None:
+    value = money.value
+    if isinstance(value, int):
+        buffer.append(_AMOUNT_INT)
+        _write_varint(buffer, _zigzag(value))
+    elif isinstance(value, Decimal):
+        sign, digits, exponent = value.as_tuple()
+        unscaled = int("".join(map(str, digits)) or "0")
+        buffer.append(_AMOUNT_DECIMAL)
+        _write_varint(buffer, _zigzag(-unscaled if sign else unscaled))
+        _write_varint(buffer, _zigzag(exponent))
+    else:
+        buffer.append(_AMOUNT_FLOAT)
+        buffer += _float.pack(value)
+    _write_str(buffer, money.currency)
+
+
+def _read_money(data: memoryview, offset: int) -> Tuple[Money, int]:
+    tag = data[offset]
+    offset += 1
+    if tag == _AMOUNT_INT:
+        raw, offset = _read_varint(data, offset)
+        value = _unzigzag(raw)
+    elif tag == _AMOUNT_DECIMAL:
+        raw, offset = _read_varint(data, offset)
+        exponent, offset = _read_varint(data, offset)
+        value = Decimal(_unzigzag(raw)).scaleb(_unzigzag(exponent))
+    else:
+        (value,) = _float.unpack_from(data, offset)
+        offset += _float.size
+    currency, offset = _read_str(data, offset)
+    return Money(value, currency), offset
+
+
+def _write_field(buffer: bytearray, kind: FieldKind, value: Any) -> None:
+    if kind == "id":
+        buffer += value.value.bytes
+    elif kind == "money":
+        _write_money(buffer, value)
+    elif kind == "int":
+        _write_varint(buffer, _zigzag(value))
+    else:
+        _write_str(buffer, value)
+
+
+def _read_field(data: memoryview, offset: int, kind: FieldKind) -> Tuple[Any, int]:
+    if kind == "id":
+        return Id.from_bytes(data[offset:offset + 16]), offset + 16
+    if kind == "money":
+        return _read_money(data, offset)
+    if kind == "int":
+        raw, offset = _read_varint(data, offset)
+        return _unzigzag(raw), offset
+    return _read_str(data, offset)
+
+
+def _build_event(schema: EventSchema, attributes: Dict[str, Any]) -> DomainEvent:
+    # Events are restored without calling __init__, which would assign a new id and timestamp.
+    if schema.upcast:
+        attributes = schema.upcast(attributes)
+    event = schema.event_class.__new__(schema.event_class)
+    event.__dict__.update(attributes)
+    return event
+
+
+class BinaryCodec:
+    def __init__(self, registry: SchemaRegistry) -> None:
+        self._registry = registry
+
+    def encode(self, event: DomainEvent, buffer: Optional[bytearray] = None) -> bytearray:
+        buffer = bytearray() if buffer is None else buffer
+        schema = self._registry.for_event(event)
+        _write_varint(buffer, schema.type_id)
+        _write_varint(buffer, schema.version)
+        buffer += event.id.bytes
+        delta = event.created_at - _EPOCH
+        _write_varint(buffer, _zigzag((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds))
+        for name, kind in schema.fields:
+            _write_field(buffer, kind, getattr(event, name))
+        return buffer
+
+    def decode(self, data: Buffer, offset: int = 0) -> Tuple[DomainEvent, int]:
+        data = data if isinstance(data, memoryview) else memoryview(data)
+        type_id, offset = _read_varint(data, offset)
+        version, offset = _read_varint(data, offset)
+        schema = self._registry.for_type(type_id, version)
+        attributes: Dict[str, Any] = {"id": Id.from_bytes(data[offset:offset + 16]).value}
+        offset += 16
+        timestamp, offset = _read_varint(data, offset)
+        attributes["created_at"] = _EPOCH + timedelta(microseconds=_unzigzag(timestamp))
+        for name, kind in schema.fields:
+            attributes[name], offset = _read_field(data, offset, kind)
+        return _build_event(schema, attributes), offset
+
+    def encode_many(self, events: List[DomainEvent]) -> bytearray:
+        buffer = bytearray()
+        _write_varint(buffer, len(events))
+        for event in events:
+            self.encode(event, buffer)
+        return buffer
+
+    def decode_many(self, data: Buffer) -> List[DomainEvent]:
+        data = data if isinstance(data, memoryview) else memoryview(data)
+        count, offset = _read_varint(data, 0)
+        events = []
+        for _ in range(count):
+            event, offset = self.decode(data, offset)
+            events.append(event)
+        return events
+
+    def serialize(self, event: DomainEvent) -> bytes:
+        return bytes(self.encode(event))
+
+    def deserialize(self, data: bytes) -> DomainEvent:
+        return self.decode(data)[0]
+
+
+class JsonCodec:
+    def __init__(self, registry: SchemaRegistry) -> None:
+        self._registry = registry
+
+    def to_dict(self, event: DomainEvent) -> Dict[str, Any]:
+        schema = self._registry.for_event(event)
+        result: Dict[str, Any] = {
+            "name": event.__class__.__name__,
+            "version": schema.version,
+            "id": str(event.id),
+            "created_at": event.created_at.isoformat(),
+        }
+        for name, kind in schema.fields:
+            value = getattr(event, name)
+            if kind == "id":
+                value = str(value.value)
+            elif kind == "money":
+                amount = value.value
+                value = {"value": str(amount) if isinstance(amount, Decimal) else amount, "currency": value.currency}
+            result[name] = value
+        return result
+
+    def from_dict(self, data: Dict[str, Any]) -> DomainEvent:
+        latest = self._registry.for_name(data["name"])
+        schema = self._registry.for_type(latest.type_id, data["version"])
+        attributes: Dict[str, Any] = {
+            "id": UUID(data["id"]),
+            "created_at": datetime.fromisoformat(data["created_at"]),
+        }
+        for name, kind in schema.fields:
+            value = data[name]
+            if kind == "id":
+                value = Id(value)
+            elif kind == "money":
+                amount = value["value"]
+                value = Money(Decimal(amount) if isinstance(amount, str) else amount, value["currency"])
+            attributes[name] = value
+        return _build_event(schema, attributes)
+
+    def serialize(self, event: DomainEvent) -> bytes:
+        return json.dumps(self.to_dict(event)).encode()
+
+    def deserialize(self, data: bytes) -> DomainEvent:
+        return self.from_dict(json.loads(data))
+
+
+def wallet_registry() -> SchemaRegistry:
+    registry = SchemaRegistry()
+    wallet_fields: List[Tuple[str, FieldKind]] = [("wallet_id", "id"), ("amount", "money")]
+    registry.register(FundsDeposited, 1, wallet_fields)
+    registry.register(FundsWithdrawn, 2, wallet_fields)
+    registry.register(OverdraftOccurred, 3, wallet_fields)
+    registry.register(OverdraftLimitHit, 4, wallet_fields)
+    registry.register(WalletLocked, 5, wallet_fields)
+    return registry
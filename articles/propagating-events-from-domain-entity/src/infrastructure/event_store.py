@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import pickle
+from abc import abstractmethod
+from sqlite3 import Connection, IntegrityError, connect
+from typing import Dict, Iterable, List, Optional, Protocol, Set, Tuple
+from uuid import UUID
+
+from domain.entity import Id
+from domain.event import DomainEvent
+
+
+class ConcurrencyError(Exception):
+    def __init__(self, message: str, aggregate_ids: Iterable[UUID] = ()) -> None:
+        super().__init__(message)
+        self.aggregate_ids = list(aggregate_ids)
+
+
+class EventSerializer(Protocol):
+    @abstractmethod
+    def serialize(self, event: DomainEvent) -> bytes:
+        ...
+
+    @abstractmethod
+    def deserialize(self, data: bytes) -> DomainEvent:
+        ...
+
+
+class PickleSerializer:
+    def serialize(self, event: DomainEvent) -> bytes:
+        return pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def deserialize(self, data: bytes) -> DomainEvent:
+        return pickle.loads(data)
+
+
+class SqliteEventStore:
+    def __init__(
+        self,
+        path: str = ":memory:",
+        batch_size: int = 500,
+        serializer: EventSerializer = PickleSerializer(),
+        timeout: float = 5.0,
+    ) -> None:
+        self._path = path
+        self._connection: Connection = connect(path, isolation_level=None, check_same_thread=False, timeout=timeout)
+        self._batch_size = batch_size
+        self._serializer = serializer
+        self._pending: List[Tuple[bytes, int, str, bytes]] = []
+        self._versions: Dict[UUID, int] = {}
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                position INTEGER PRIMARY KEY AUTOINCREMENT,
+                aggregate_id BLOB NOT NULL,
+                version INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                UNIQUE (aggregate_id, version)
+            )
+        """)
+
+    @property
+    def connection(self) -> Connection:
+        return self._connection
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def serializer(self) -> EventSerializer:
+        return self._serializer
+
+    def version(self, aggregate_id: Id) -> int:
+        key = aggregate_id.value
+        if key not in self._versions:
+            row = self._connection.execute(
+                "SELECT MAX(version) FROM events WHERE aggregate_id = ?", (key.bytes,)
+            ).fetchone()
+            self._versions[key] = row[0] or 0
+        return self._versions[key]
+
+    def append(self, aggregate_id: Id, events: List[DomainEvent], expected_version: int) -> int:
+        current_version = self.version(aggregate_id)
+        if current_version != expected_version:
+            raise ConcurrencyError(
+                f"Aggregate `{aggregate_id.value}` is at version {current_version}, expected {expected_version}",
+                [aggregate_id.value],
+            )
+
+        key = aggregate_id.value.bytes
+        serialize = self._serializer.serialize
+        for offset, event in enumerate(events, start=1):
+            self._pending.append((key, current_version + offset, event.name, serialize(event)))
+        self._versions[aggregate_id.value] = current_version + len(events)
+
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+        return self._versions[aggregate_id.value]
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.executemany(
+                "INSERT INTO events (aggregate_id, version, name, payload) VALUES (?, ?, ?, ?)",
+                pending,
+            )
+            self._connection.execute("COMMIT")
+        except IntegrityError as error:
+            self._rollback()
+            conflicting = self._conflicting(pending)
+            # Streams that did not conflict were acknowledged by `append`, they are written with the next flush.
+            self._pending = [row for row in pending if row[0] not in conflicting] + self._pending
+            # A flush triggered by `append` may fail for other aggregates, so the error names the ones discarded.
+            aggregate_ids = sorted(UUID(bytes=key) for key in conflicting)
+            for aggregate_id in aggregate_ids:
+                self._versions.pop(aggregate_id, None)
+            names = ", ".join(f"`{aggregate_id}`" for aggregate_id in aggregate_ids)
+            raise ConcurrencyError(
+                f"Concurrent append detected for aggregates {names}, their pending events were discarded",
+                aggregate_ids,
+            ) from error
+        except BaseException:
+            self._rollback()
+            self._pending = pending + self._pending
+            raise
+
+    def _rollback(self) -> None:
+        if self._connection.in_transaction:
+            self._connection.execute("ROLLBACK")
+
+    def _conflicting(self, pending: List[Tuple[bytes, int, str, bytes]]) -> Set[bytes]:
+        first_versions: Dict[bytes, int] = {}
+        for key, version, _, _ in pending:
+            first_versions[key] = min(version, first_versions.get(key, version))
+        conflicting = set()
+        for key, first_version in first_versions.items():
+            stored = self._connection.execute("SELECT MAX(version) FROM events WHERE aggregate_id = ?", (key,))
+            if (stored.fetchone()[0] or 0) >= first_version:
+                conflicting.add(key)
+        return conflicting or set(first_versions)
+
+    def load(self, aggregate_id: Id, from_version: int = 0) -> List[DomainEvent]:
+        self.flush()
+        deserialize = self._serializer.deserialize
+        cursor = self._connection.execute(
+            "SELECT payload FROM events WHERE aggregate_id = ? AND version > ? ORDER BY version",
+            (aggregate_id.value.bytes, from_version),
+        )
+        return [deserialize(payload) for (payload,) in cursor]
+
+    def read_all(
+        self, after_position: int = 0, until_position: Optional[int] = None, limit: int = -1
+    ) -> List[Tuple[int, DomainEvent]]:
+        self.flush()
+        deserialize = self._serializer.deserialize
+        cursor = self._connection.execute(
+            "SELECT position, payload FROM events WHERE position > ? AND position <= ? ORDER BY position LIMIT ?",
+            (after_position, self.last_position() if until_position is None else until_position, limit),
+        )
+        return [(position, deserialize(payload)) for position, payload in cursor]
+
+    def aggregate_ids(self) -> List[bytes]:
+        self.flush()
+        return [row[0] for row in self._connection.execute("SELECT DISTINCT aggregate_id FROM events")]
+
+    def last_position(self) -> int:
+        self.flush()
+        return self._connection.execute("SELECT MAX(position) FROM events").fetchone()[0] or 0
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> SqliteEventStore:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
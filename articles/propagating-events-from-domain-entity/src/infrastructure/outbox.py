@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from sqlite3 import Connection
+from threading import Event, Thread
+from time import time
+from typing import Callable, Iterable, Optional
+
+from domain.event import DomainEvent
+from domain.wallet_event_bus_injection import EventBus
+from infrastructure.event_store import EventSerializer, PickleSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    def __init__(self, connection: Connection, serializer: EventSerializer = PickleSerializer()) -> None:
+        self._connection = connection
+        self._serializer = serializer
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                position INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_id BLOB NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                published_at REAL
+            )
+        """)
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_unpublished ON outbox (position) WHERE published_at IS NULL"
+        )
+
+    @property
+    def connection(self) -> Connection:
+        return self._connection
+
+    def record(self, events: Iterable[DomainEvent]) -> None:
+        # Runs inside the caller's transaction, duplicates are ignored by event id.
+        serialize = self._serializer.serialize
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO outbox (event_id, name, payload, created_at) VALUES (?, ?, ?, ?)",
+            [(event.id.bytes, event.name, serialize(event), event.created_at.timestamp()) for event in events],
+        )
+
+    def fetch_unpublished(self, limit: int) -> list:
+        cursor = self._connection.execute(
+            "SELECT position, payload, created_at FROM outbox WHERE published_at IS NULL ORDER BY position LIMIT ?",
+            (limit,),
+        )
+        deserialize = self._serializer.deserialize
+        return [(position, deserialize(payload), created_at) for position, payload, created_at in cursor]
+
+    def mark_published(self, positions: Iterable[int], published_at: float) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "UPDATE outbox SET published_at = ? WHERE position = ?",
+                [(published_at, position) for position in positions],
+            )
+
+    def pending(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM outbox WHERE published_at IS NULL").fetchone()[0]
+
+    def oldest_pending(self) -> Optional[float]:
+        return self._connection.execute(
+            "SELECT MIN(created_at) FROM outbox WHERE published_at IS NULL"
+        ).fetchone()[0]
+
+
+@dataclass
+class RelayMetrics:
+    published: int = 0
+    batches: int = 0
+    failures: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        outbox: Outbox,
+        event_bus: EventBus,
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+        clock: Callable[[], float] = time,
+    ) -> None:
+        self._outbox = outbox
+        self._event_bus = event_bus
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+        self.metrics = RelayMetrics()
+
+    @property
+    def lag(self) -> float:
+        oldest = self._outbox.oldest_pending()
+        return 0.0 if oldest is None else max(self._clock() - oldest, 0.0)
+
+    def relay_once(self) -> int:
+        batch = self._outbox.fetch_unpublished(self.batch_size)
+        if not batch:
+            return 0
+
+        published = []
+        try:
+            for position, event, created_at in batch:
+                self._event_bus.publish(event)
+                published.append((position, created_at))
+        except Exception:
+            # Events published so far are marked, the rest is redelivered on the next poll.
+            self.metrics.failures += 1
+            raise
+        finally:
+            if published:
+                now = self._clock()
+                self._outbox.mark_published([position for position, _ in published], now)
+                self.metrics.published += len(published)
+                self.metrics.batches += 1
+                self.metrics.last_lag = max(now - created_at for _, created_at in published)
+                self.metrics.max_lag = max(self.metrics.max_lag, self.metrics.last_lag)
+
+        return len(published)
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                relayed = self.relay_once()
+            except Exception:
+                logger.exception("Failed to relay outbox events, retrying in %.1fs", self.poll_interval)
+                relayed = 0
+            if relayed < self.batch_size:
+                self._stopped.wait(self.poll_interval)
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from domain.entity import Id
+from domain.event import DomainEvent
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import ConcurrencyError
+from infrastructure.wallet_store import SqliteWalletStore, WalletRow
+
+
+@dataclass
+class RepositoryMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    conflicts: int = 0
+    flushes: int = 0
+    flushed_wallets: int = 0
+    last_flush_latency: float = 0.0
+    max_flush_latency: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _PendingWrite:
+    row: WalletRow
+    expected_version: int
+    version: int
+    events: List[DomainEvent]
+
+
+def _row_size(row: WalletRow) -> int:
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+class WalletSession:
+    def __init__(self, repository: WalletRepository) -> None:
+        self._repository = repository
+        self._identity_map: Dict[Id, Tuple[Wallet, int, Optional[WalletRow]]] = {}
+
+    def get(self, wallet_id: Id) -> Optional[Wallet]:
+        if wallet_id in self._identity_map:
+            return self._identity_map[wallet_id][0]
+        loaded = self._repository.load(wallet_id)
+        if loaded is None:
+            return None
+        wallet, version = loaded
+        self._identity_map[wallet_id] = (wallet, version, SqliteWalletStore.dump(wallet))
+        return wallet
+
+    def add(self, wallet: Wallet) -> None:
+        self._identity_map[wallet.id] = (wallet, 0, None)
+
+    def commit(self) -> None:
+        for wallet, version, loaded_row in self._identity_map.values():
+            if SqliteWalletStore.dump(wallet) != loaded_row:
+                self._repository.stage(wallet, version)
+        self._identity_map.clear()
+
+
+class WalletRepository:
+    def __init__(
+        self,
+        store: SqliteWalletStore,
+        max_cache_bytes: int = 64 * 1024 * 1024,
+        flush_size: int = 500,
+        clock: Callable[[], float] = perf_counter,
+    ) -> None:
+        self._store = store
+        self._max_cache_bytes = max_cache_bytes
+        self._flush_size = flush_size
+        self._clock = clock
+        self._cache: OrderedDict[bytes, Tuple[WalletRow, int]] = OrderedDict()
+        self._cache_bytes = 0
+        self._pending: Dict[bytes, _PendingWrite] = {}
+        self.metrics = RepositoryMetrics()
+
+    @property
+    def cache_bytes(self) -> int:
+        return self._cache_bytes
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @contextmanager
+    def session(self) -> Iterator[WalletSession]:
+        session = WalletSession(self)
+        yield session
+        session.commit()
+
+    def load(self, wallet_id: Id) -> Optional[Tuple[Wallet, int]]:
+        key = wallet_id.value.bytes
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.metrics.hits += 1
+        else:
+            self.metrics.misses += 1
+            cached = self._store.fetch(key)
+            if cached is None:
+                return None
+            self._cache_row(key, *cached)
+        row, version = cached
+        return self._store.restore(row), version
+
+    def stage(self, wallet: Wallet, loaded_version: int) -> None:
+        key = wallet.id.value.bytes
+        cached = self._cache.get(key)
+        current_version = cached[1] if cached else self._current_version(key)
+        if current_version != loaded_version:
+            self.metrics.conflicts += 1
+            raise ConcurrencyError(
+                f"Wallet `{wallet.id}` is at version {current_version}, it was loaded at {loaded_version}"
+            )
+
+        row = self._store.dump(wallet)
+        events = wallet.collect_events()
+        pending = self._pending.get(key)
+        if pending:
+            pending.row = row
+            pending.version = loaded_version + 1
+            pending.events.extend(events)
+        else:
+            self._pending[key] = _PendingWrite(row, loaded_version, loaded_version + 1, events)
+        self._cache_row(key, row, loaded_version + 1)
+
+        if len(self._pending) >= self._flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        start = self._clock()
+        conflicts: List[bytes] = []
+        try:
+            while pending:
+                try:
+                    self._write(pending)
+                    break
+                except ConcurrencyError:
+                    # The whole batch was rolled back, only wallets changed by another writer are dropped from it.
+                    stale = [
+                        key for key, write in pending.items() if self._current_version(key) != write.expected_version
+                    ]
+                    if not stale:
+                        raise
+                    for key in stale:
+                        del pending[key]
+                        self._evict(key)
+                    conflicts += stale
+        except BaseException:
+            self._pending = {**pending, **self._pending}
+            raise
+        latency = self._clock() - start
+        self.metrics.flushes += 1
+        self.metrics.flushed_wallets += len(pending)
+        self.metrics.last_flush_latency = latency
+        self.metrics.max_flush_latency = max(self.metrics.max_flush_latency, latency)
+        if conflicts:
+            self.metrics.conflicts += len(conflicts)
+            raise ConcurrencyError(
+                f"Wallets {', '.join(f'`{UUID(bytes=key)}`' for key in conflicts)} were modified by another writer"
+            )
+
+    def _write(self, pending: Dict[bytes, _PendingWrite]) -> None:
+        rows = [(write.row, write.expected_version, write.version) for write in pending.values()]
+        events = [event for write in pending.values() for event in write.events]
+        self._store.save_rows(rows, events)
+
+    def _current_version(self, key: bytes) -> int:
+        stored = self._store.fetch(key)
+        return stored[1] if stored else 0
+
+    def _cache_row(self, key: bytes, row: WalletRow, version: int) -> None:
+        self._evict(key)
+        self._cache[key] = (row, version)
+        self._cache_bytes += _row_size(row)
+        conflict: Optional[ConcurrencyError] = None
+        while self._cache_bytes > self._max_cache_bytes and len(self._cache) > 1:
+            oldest = next(iter(self._cache))
+            if oldest in self._pending:
+                # Dirty wallets cannot leave the cache before they are written.
+                try:
+                    self.flush()
+                except ConcurrencyError as error:
+                    # The other wallets were written and the conflicting ones evicted, trimming can go on.
+                    conflict = error
+                    continue
+            self._evict(oldest)
+            self.metrics.evictions += 1
+        if conflict is not None:
+            raise conflict
+
+    def _evict(self, key: bytes) -> None:
+        cached = self._cache.pop(key, None)
+        if cached is not None:
+            self._cache_bytes -= _row_size(cached[0])
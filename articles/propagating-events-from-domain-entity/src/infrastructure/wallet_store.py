@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from sqlite3 import Connection, IntegrityError
+from typing import Dict, List, Optional, Tuple, Union
+from uuid import UUID
+
+from domain.entity import Id
+from domain.event import DomainEvent
+from domain.money import Amount, Money
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import ConcurrencyError
+from infrastructure.outbox import Outbox
+
+
+def _dump_amount(value: Amount) -> Union[int, float, str]:
+    # Columns are declared without affinity, so ints and floats are kept as they are.
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def _load_amount(value: Union[int, float, str]) -> Amount:
+    return Decimal(value) if isinstance(value, str) else value
+
+
+WalletRow = Tuple[bytes, Union[int, float, str], Union[int, float, str], str, int]
+
+
+class SqliteWalletStore:
+    def __init__(self, connection: Connection, outbox: Optional[Outbox] = None) -> None:
+        self._connection = connection
+        self._outbox = outbox or Outbox(connection)
+        # Version of every wallet this store has read or written, the next write expects it unchanged.
+        self._versions: Dict[bytes, int] = {}
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS wallets (
+                id BLOB PRIMARY KEY,
+                balance,
+                overdraft_limit,
+                currency TEXT NOT NULL,
+                locked INTEGER NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+
+    @property
+    def outbox(self) -> Outbox:
+        return self._outbox
+
+    def save(self, wallet: Wallet) -> None:
+        events = wallet.collect_events()
+        try:
+            self.save_all([wallet], events)
+        except Exception:
+            # Events stay on the aggregate until they are committed together with it.
+            wallet.requeue_events(events)
+            raise
+
+    def save_all(self, wallets: List[Wallet], events: List[DomainEvent]) -> None:
+        rows = []
+        for wallet in wallets:
+            row = self.dump(wallet)
+            expected_version = self._versions.get(row[0], 0)
+            rows.append((row, expected_version, expected_version + 1))
+        self.save_rows(rows, events)
+        for row, _, version in rows:
+            self._versions[row[0]] = version
+
+    def get(self, wallet_id: Id) -> Optional[Wallet]:
+        result = self.fetch(wallet_id.value.bytes)
+        if result is None:
+            return None
+        row, version = result
+        self._versions[row[0]] = version
+        return self.restore(row)
+
+    def fetch(self, key: bytes) -> Optional[Tuple[WalletRow, int]]:
+        row = self._connection.execute(
+            "SELECT id, balance, overdraft_limit, currency, locked, version FROM wallets WHERE id = ?",
+            (key,),
+        ).fetchone()
+        return (row[:5], row[5]) if row else None
+
+    def save_rows(self, rows: List[Tuple[WalletRow, int, int]], events: List[DomainEvent]) -> None:
+        # Each row is written only if the stored version still matches the expected one.
+        with self._connection:
+            for row, expected_version, new_version in rows:
+                if expected_version == 0:
+                    try:
+                        self._connection.execute(
+                            """INSERT INTO wallets (id, balance, overdraft_limit, currency, locked, version)
+                            VALUES (?, ?, ?, ?, ?, ?)""",
+                            (*row, new_version),
+                        )
+                    except IntegrityError as error:
+                        raise ConcurrencyError(f"Wallet `{UUID(bytes=row[0])}` already exists") from error
+                    continue
+
+                cursor = self._connection.execute(
+                    """UPDATE wallets SET balance = ?, overdraft_limit = ?, currency = ?, locked = ?, version = ?
+                    WHERE id = ? AND version = ?""",
+                    (*row[1:], new_version, row[0], expected_version),
+                )
+                if cursor.rowcount != 1:
+                    raise ConcurrencyError(
+                        f"Wallet `{UUID(bytes=row[0])}` was modified, expected version {expected_version}"
+                    )
+            self._outbox.record(events)
+
+    @staticmethod
+    def dump(wallet: Wallet) -> WalletRow:
+        return (
+            wallet.id.value.bytes,
+            _dump_amount(wallet.balance.value),
+            _dump_amount(wallet.overdraft_limit.value),
+            wallet.balance.currency,
+            int(wallet.locked),
+        )
+
+    @staticmethod
+    def restore(row: WalletRow) -> Wallet:
+        wallet_id, balance, overdraft_limit, currency, locked = row
+        return Wallet.restore(
+            Id.from_bytes(wallet_id),
+            Money(_load_amount(balance), currency),
+            Money(_load_amount(overdraft_limit), currency),
+            bool(locked),
+        )
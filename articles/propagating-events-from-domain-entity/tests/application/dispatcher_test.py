@@ -0,0 +1,162 @@
+from threading import Event
+
+import pytest
+
+from application.dispatcher import EventDispatcher, LatencyHistogram, ProcessedEvents
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.wallet import FundsDeposited, OverdraftLimitHit
+from domain.wallet_internal_event_collection import Wallet
+
+
+def _overdraft_events() -> list:
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(-25))
+    return wallet.collect_events()
+
+
+def test_slow_handler_does_not_block_others() -> None:
+    # given
+    dispatcher = EventDispatcher()
+    audit_released = Event()
+    alerted = Event()
+    dispatcher.subscribe(DomainEvent, lambda event: audit_released.wait(5), name="audit")
+    dispatcher.subscribe(OverdraftLimitHit, lambda event: alerted.set(), name="alerting")
+
+    # when
+    futures = dispatcher.publish_many(_overdraft_events())
+
+    # then
+    assert alerted.wait(5)
+    assert not audit_released.is_set()
+
+    audit_released.set()
+    dispatcher.drain(futures)
+    dispatcher.shutdown()
+
+
+def test_retries_failing_handler_with_backoff() -> None:
+    # given
+    delays = []
+    dispatcher = EventDispatcher(max_attempts=3, base_delay=0.1, sleep=delays.append)
+    calls = []
+
+    def flaky(event: DomainEvent) -> None:
+        calls.append(event)
+        if len(calls) < 3:
+            raise ConnectionError("Downstream unavailable")
+
+    dispatcher.subscribe(FundsDeposited, flaky, name="flaky")
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(5))
+
+    # when
+    futures = dispatcher.publish_many(wallet.collect_events())
+    dispatcher.drain(futures)
+
+    # then
+    assert len(calls) == 3
+    assert delays == [0.1, 0.2]
+    assert dispatcher.metrics["flaky"].failures == 2
+    assert dispatcher.metrics["flaky"].retries == 2
+    assert dispatcher.metrics["flaky"].count == 3
+    dispatcher.shutdown()
+
+
+def test_gives_up_after_max_attempts_and_allows_redelivery() -> None:
+    # given
+    dispatcher = EventDispatcher(max_attempts=2, sleep=lambda delay: None)
+    dispatcher.subscribe(FundsDeposited, lambda event: 1 / 0, name="broken")
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(5))
+    event = wallet.collect_events()[0]
+
+    # when
+    futures = dispatcher.publish(event)
+    dispatcher.drain(futures)
+
+    # then
+    with pytest.raises(ZeroDivisionError):
+        futures[0].result()
+    assert len(dispatcher.publish(event)) == 1
+    dispatcher.shutdown()
+
+
+def test_skips_already_processed_events() -> None:
+    # given
+    dispatcher = EventDispatcher()
+    handled = []
+    dispatcher.subscribe(FundsDeposited, handled.append, name="handler")
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(5))
+    event = wallet.collect_events()[0]
+
+    # when
+    dispatcher.drain(dispatcher.publish(event))
+    dispatcher.drain(dispatcher.publish(event))
+
+    # then
+    assert handled == [event]
+    dispatcher.shutdown()
+
+
+def test_runs_every_instance_of_the_same_handler_class() -> None:
+    # given
+    class Recorder:
+        def __init__(self) -> None:
+            self.events = []
+
+        def __call__(self, event: DomainEvent) -> None:
+            self.events.append(event)
+
+    dispatcher = EventDispatcher()
+    first, second = Recorder(), Recorder()
+    first_name = dispatcher.subscribe(FundsDeposited, first)
+    second_name = dispatcher.subscribe(FundsDeposited, second, workers=2)
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(5))
+    event = wallet.collect_events()[0]
+
+    # when
+    dispatcher.drain(dispatcher.publish(event))
+
+    # then
+    assert first_name != second_name
+    assert first.events == [event]
+    assert second.events == [event]
+    with pytest.raises(ValueError):
+        dispatcher.subscribe(FundsDeposited, Recorder(), name=first_name)
+    dispatcher.shutdown()
+
+
+def test_processed_events_expire() -> None:
+    # given
+    now = [0.0]
+    processed = ProcessedEvents(max_size=2, ttl=10, clock=lambda: now[0])
+    event_ids = [event.id for event in _overdraft_events()]
+
+    # when
+    assert processed.claim(event_ids[0], "handler")
+    assert not processed.claim(event_ids[0], "handler")
+    now[0] = 11
+
+    # then
+    assert processed.claim(event_ids[0], "handler")
+    assert processed.claim(event_ids[1], "handler")
+    assert processed.claim(event_ids[2], "handler")
+    assert len(processed) == 2
+
+
+def test_latency_histogram_percentiles() -> None:
+    # given
+    histogram = LatencyHistogram()
+
+    # when
+    for seconds in [0.0005] * 98 + [0.2, 2.0]:
+        histogram.observe(seconds)
+
+    # then
+    assert histogram.count == 100
+    assert histogram.percentile(0.5) == 0.001
+    assert histogram.percentile(0.99) == 0.5
+    assert histogram.percentile(1.0) == 5.0
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from application.projections import DepositTotals, OverdrawnWallets, ProjectionEngine
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import SqliteEventStore
+
+
+def _seed(store: SqliteEventStore) -> list:
+    wallets = [Wallet(Money(100)) for _ in range(3)]
+    wallets[0].transact_many([Money(10), Money(5), Money(-20)])
+    wallets[1].transact_many([Money(30), Money(-10)])
+    wallets[2].transact_many([Money(-50)])
+    for wallet in wallets:
+        store.append(wallet.id, wallet.collect_events(), expected_version=0)
+    return wallets
+
+
+def test_can_project_wallet_events_incrementally() -> None:
+    # given
+    store = SqliteEventStore()
+    deposits = DepositTotals()
+    overdrawn = OverdrawnWallets()
+    engine = ProjectionEngine(store, deposits, overdrawn)
+    first, second, third = _seed(store)
+
+    # when
+    processed = engine.catch_up(batch_size=2)
+
+    # then
+    assert processed == store.last_position()
+    assert engine.position == store.last_position()
+    assert deposits.total(first.id) == 15
+    assert deposits.total(second.id) == 30
+    assert deposits.total(third.id) == 0
+    assert overdrawn.overdrawn() == {first.id.value, third.id.value}
+
+    # when
+    second.transact(Money(-25))
+    store.append(second.id, second.collect_events(), expected_version=2)
+    third.transact(Money(60))
+    store.append(third.id, third.collect_events(), expected_version=2)
+
+    # then
+    assert engine.catch_up() == 3
+    assert overdrawn.is_overdrawn(second.id)
+    assert not overdrawn.is_overdrawn(third.id)
+    assert deposits.total(third.id) == 60
+
+
+def test_can_rebuild_projections_in_parallel(tmp_path: Path) -> None:
+    # given
+    store = SqliteEventStore(str(tmp_path / "events.db"))
+    first, second, third = _seed(store)
+    deposits, overdrawn = DepositTotals(), OverdrawnWallets()
+    engine = ProjectionEngine(store, deposits, overdrawn)
+    engine.catch_up()
+
+    # when
+    position = engine.rebuild(workers=2, batch_size=2)
+
+    # then
+    assert engine.projections == [deposits, overdrawn]
+    assert position == store.last_position()
+    assert deposits.total(first.id) == 15
+    assert overdrawn.overdrawn() == {first.id.value, third.id.value}
+
+
+def test_can_subscribe_to_live_events() -> None:
+    # given
+    deposits = DepositTotals()
+    engine = ProjectionEngine(SqliteEventStore(), deposits)
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+
+    # when
+    for event in wallet.collect_events():
+        engine.publish(event)
+
+    # then
+    assert deposits.total(wallet.id) == 10
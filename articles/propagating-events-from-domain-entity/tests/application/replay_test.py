@@ -0,0 +1,50 @@
+import random
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from application.projections import DepositTotals
+from application.replay import ReplayEngine, ReplayProgress
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import SqliteEventStore
+
+
+def _seed(store: SqliteEventStore, count: int) -> List[Wallet]:
+    random.seed(3)
+    wallets = []
+    for _ in range(count):
+        wallet = Wallet(Money(20))
+        wallet.transact_many([Money(random.randint(-15, 15)) for _ in range(10)])
+        store.append(wallet.id, wallet.collect_events(), expected_version=0)
+        wallets.append(wallet)
+    return wallets
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_can_replay_wallets_from_event_log(tmp_path: Path, workers: int) -> None:
+    # given
+    store = SqliteEventStore(str(tmp_path / "events.db"))
+    wallets = _seed(store, 30)
+    reports: List[ReplayProgress] = []
+    engine = ReplayEngine(
+        store, Money(20), projection_types=[DepositTotals], workers=workers, on_progress=reports.append
+    )
+
+    # when
+    result = engine.run()
+
+    # then
+    assert len(result.wallets) == len(wallets)
+    for wallet in wallets:
+        replayed = result.wallets[wallet.id.value]
+        assert replayed.balance.value == wallet.balance.value
+        assert replayed.locked == wallet.locked
+        assert replayed.collect_events() == []
+
+    deposits = result.projections[0]
+    assert deposits.total(wallets[0].id) > 0
+    assert result.progress.events == store.last_position()
+    assert result.progress.aggregates == len(wallets)
+    assert reports[-1].completed_partitions == reports[-1].partitions == len(reports)
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+from application.rules import RulesEngine, SlidingWindow, VelocityLimitExceeded, VelocityRule
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.wallet import OverdraftOccurred
+from domain.wallet_event_bus_injection import InMemoryEventBus
+from domain.wallet_internal_event_collection import Wallet
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _withdraw(wallet: Wallet, seconds: float) -> List[DomainEvent]:
+    wallet.transact(Money(-1))
+    events = wallet.collect_events()
+    for event in events:
+        event.created_at = START + timedelta(seconds=seconds)
+    return events
+
+
+def test_emits_decision_when_velocity_limit_is_exceeded() -> None:
+    # given
+    bus = InMemoryEventBus()
+    engine = RulesEngine([VelocityRule("withdrawals_per_minute", limit=3)], bus)
+    wallet = Wallet(Money(100))
+
+    # when
+    for second in [0, 10, 20, 30, 40]:
+        engine.publish_many(_withdraw(wallet, second))
+
+    # then
+    assert len(bus.events) == 1
+    decision = bus.events[0]
+    assert isinstance(decision, VelocityLimitExceeded)
+    assert decision.wallet_id == wallet.id
+    assert decision.rule == "withdrawals_per_minute"
+    assert decision.count == 4
+
+
+def test_window_slides_over_time() -> None:
+    # given
+    bus = InMemoryEventBus()
+    engine = RulesEngine([VelocityRule("withdrawals_per_minute", limit=3)], bus)
+    wallet = Wallet(Money(100))
+
+    # when
+    for second in [0, 25, 50, 70, 95, 120, 145]:
+        engine.publish_many(_withdraw(wallet, second))
+
+    # then
+    assert bus.events == []
+
+
+def test_evaluates_overdraft_events_per_wallet() -> None:
+    # given
+    bus = InMemoryEventBus()
+    rule = VelocityRule("overdrafts_per_minute", limit=1, event_types=(OverdraftOccurred,))
+    engine = RulesEngine([rule], bus)
+    overdrawn, other = Wallet(Money(100)), Wallet(Money(100))
+
+    # when
+    for second in [0, 1]:
+        engine.publish_many(_withdraw(overdrawn, second))
+        engine.publish_many(_withdraw(other, second))
+
+    # then
+    assert len(bus.events) == 2
+    assert {event.wallet_id for event in bus.events} == {overdrawn.id, other.id}
+
+
+def test_expires_inactive_wallets() -> None:
+    # given
+    engine = RulesEngine([VelocityRule("withdrawals_per_minute", limit=3)], InMemoryEventBus(), max_wallets=2)
+    wallets = [Wallet(Money(100)) for _ in range(3)]
+
+    # when
+    engine.publish_many(_withdraw(wallets[0], 0))
+    engine.publish_many(_withdraw(wallets[1], 30))
+
+    # then
+    assert engine.tracked_wallets("withdrawals_per_minute") == 2
+
+    # when
+    engine.publish_many(_withdraw(wallets[1], 75))
+
+    # then
+    assert engine.tracked_wallets("withdrawals_per_minute") == 1
+
+    # when
+    engine.publish_many(_withdraw(wallets[0], 76))
+    engine.publish_many(_withdraw(wallets[2], 77))
+
+    # then
+    assert engine.tracked_wallets("withdrawals_per_minute") == 2
+
+
+def test_rejects_rules_with_the_same_name() -> None:
+    # given
+    rules = [VelocityRule("withdrawals", limit=3), VelocityRule("withdrawals", limit=10, window=3600)]
+
+    # then
+    with pytest.raises(ValueError):
+        RulesEngine(rules, InMemoryEventBus())
+
+
+def test_sliding_window_ignores_events_older_than_window() -> None:
+    # given
+    window = SlidingWindow(buckets=4, head=10)
+
+    # when
+    window.add(10)
+    window.add(9)
+    window.add(6)
+
+    # then
+    assert window.total == 2
+
+    # when
+    window.add(13)
+
+    # then
+    assert window.total == 2
+
+    # when
+    window.add(100)
+
+    # then
+    assert window.total == 1
@@ -0,0 +1,107 @@
+from pathlib import Path
+from sqlite3 import connect
+
+import pytest
+
+from application.unit_of_work import UnitOfWork
+from domain.money import Money
+from domain.wallet import FundsDeposited, WalletLocked
+from domain.wallet_event_bus_injection import InMemoryEventBus
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import ConcurrencyError
+from infrastructure.wallet_store import SqliteWalletStore
+
+
+def test_persists_and_publishes_touched_wallets() -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    bus = InMemoryEventBus()
+    first, second, untouched = Wallet(Money(10)), Wallet(Money(10)), Wallet(Money(10))
+
+    # when
+    with UnitOfWork(store, bus) as unit_of_work:
+        second.transact(Money(5))
+        first.transact_many([Money(10), Money(-15), Money(-15)])
+        second.transact(Money(1))
+
+        # then
+        assert list(unit_of_work.touched) == [second.id, first.id]
+
+    # then
+    assert store.get(first.id).locked
+    assert store.get(second.id).balance.value == 6
+    assert store.get(untouched.id) is None
+    assert store.outbox.pending() == 9
+    assert [event.wallet_id for event in bus.events] == [second.id] * 2 + [first.id] * 7
+    assert isinstance(bus.events[0], FundsDeposited)
+    assert isinstance(bus.events[-1], WalletLocked)
+    assert first.collect_events() == []
+
+
+def test_does_not_persist_failed_work() -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    bus = InMemoryEventBus()
+    wallet = Wallet(Money(10))
+
+    # when
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(store, bus):
+            wallet.transact(Money(5))
+            raise RuntimeError("Request failed")
+
+    # then
+    assert store.get(wallet.id) is None
+    assert bus.events == []
+
+
+def test_does_not_track_wallets_outside_unit_of_work() -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(5))
+
+    # when
+    with UnitOfWork(store) as unit_of_work:
+        pass
+
+    # then
+    assert unit_of_work.touched == {}
+    assert store.get(wallet.id) is None
+
+
+def test_persists_events_recorded_before_unit_of_work() -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(5))
+
+    # when
+    with UnitOfWork(store):
+        wallet.transact(Money(5))
+
+    # then
+    assert store.get(wallet.id).balance.value == 10
+    assert store.outbox.pending() == 2
+
+
+def test_rejects_wallet_changed_by_another_writer(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "wallets.db")
+    store, other = SqliteWalletStore(connect(path)), SqliteWalletStore(connect(path))
+    created = Wallet(Money(10))
+    with UnitOfWork(store):
+        created.transact(Money(5))
+    wallet = store.get(created.id)
+    with UnitOfWork(other):
+        other.get(created.id).transact(Money(3))
+
+    # when
+    with pytest.raises(ConcurrencyError):
+        with UnitOfWork(store):
+            wallet.transact(Money(1))
+
+    # then
+    assert store.get(wallet.id).balance.value == 8
+    assert store.outbox.pending() == 2
+    assert len(wallet.collect_events()) == 1
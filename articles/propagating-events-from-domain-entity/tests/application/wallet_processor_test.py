@@ -0,0 +1,80 @@
+import random
+from sqlite3 import connect
+
+import pytest
+
+from application.wallet_processor import ShardedWalletProcessor, shard_for
+from domain.entity import Id
+from domain.money import Money
+from domain.wallet import WalletLocked
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.wallet_store import SqliteWalletStore
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_processes_wallets_in_shards(executor: str) -> None:
+    # given
+    random.seed(7)
+    wallet_ids = [Id() for _ in range(20)]
+    transactions = [(random.choice(wallet_ids), Money(random.randint(-8, 10))) for _ in range(500)]
+    processor = ShardedWalletProcessor(SqliteWalletStore(connect(":memory:")), Money(10), workers=3, executor=executor)
+
+    # when
+    results = processor.process(transactions)
+
+    # then
+    assert len(results) == 3
+    wallets = {key: wallet for result in results for key, wallet in result.wallets.items()}
+    assert len(wallets) == len(wallet_ids)
+    assert sum(result.processed + result.rejected for result in results) == len(transactions)
+
+    for wallet_id in wallet_ids:
+        expected = Wallet(Money(10))
+        for transaction_id, amount in transactions:
+            if transaction_id is wallet_id and not expected.locked:
+                expected.transact(amount)
+        wallet = wallets[wallet_id.value]
+        assert wallet.balance.value == expected.balance.value
+        assert wallet.locked == expected.locked
+        assert shard_for(wallet_id, 3) == next(
+            result.shard for result in results if wallet_id.value in result.wallets
+        )
+
+
+def test_keeps_event_order_per_wallet() -> None:
+    # given
+    wallet_id = Id()
+    processor = ShardedWalletProcessor(SqliteWalletStore(connect(":memory:")), Money(10), workers=2, executor="thread")
+    transactions = [(wallet_id, Money(amount)) for amount in [10, -15, -15, 10]]
+
+    # when
+    results = processor.process(transactions)
+
+    # then
+    events = [event for result in results for event in result.events]
+    assert len(events) == 7
+    assert isinstance(events[-1], WalletLocked)
+    assert sum(result.rejected for result in results) == 1
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_applies_transactions_to_existing_wallets(executor: str) -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    existing = Wallet(Money(50))
+    existing.transact(Money(30))
+    locked = Wallet(Money(0))
+    locked.transact(Money(-1))
+    store.save(existing)
+    store.save(locked)
+    processor = ShardedWalletProcessor(store, Money(10), workers=2, executor=executor)
+
+    # when
+    results = processor.process([(existing.id, Money(-60)), (locked.id, Money(5))])
+
+    # then
+    wallets = {key: wallet for result in results for key, wallet in result.wallets.items()}
+    assert wallets[existing.id.value].balance.value == -30
+    assert not wallets[existing.id.value].locked
+    assert wallets[locked.id.value].balance.value == -1
+    assert sum(result.rejected for result in results) == 1
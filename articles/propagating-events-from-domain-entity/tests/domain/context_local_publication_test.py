@@ -0,0 +1,122 @@
+import asyncio
+from threading import Barrier, Thread
+
+import pytest
+
+from domain.money import Money
+from domain.publishing import is_publishing, publishing
+from domain.wallet import WalletLocked
+from domain.wallet_context_local_publication import Wallet
+from domain.wallet_event_bus_injection import InMemoryEventBus
+
+
+def test_context_local_publication() -> None:
+    # given
+    bus = InMemoryEventBus()
+    wallet = Wallet(Money(10))
+
+    # when
+    with publishing(bus) as pending:
+        wallet.transact(Money(10))
+        wallet.transact(Money(-15))
+        wallet.transact(Money(-15))
+
+        # then
+        assert len(pending) == 7
+        assert len(bus.events) == 0
+
+    # then
+    assert len(bus.events) == 7
+    assert isinstance(bus.events[-1], WalletLocked)
+
+
+def test_does_nothing_without_listener() -> None:
+    # given
+    wallet = Wallet(Money(10))
+
+    # when
+    wallet.transact(Money(10))
+
+    # then
+    assert not is_publishing()
+
+
+def test_drops_events_of_failed_block() -> None:
+    # given
+    bus = InMemoryEventBus()
+    wallet = Wallet(Money(10))
+
+    # when
+    with pytest.raises(RuntimeError):
+        with publishing(bus):
+            wallet.transact(Money(10))
+            raise RuntimeError("Failed to persist wallet")
+
+    # then
+    assert bus.events == []
+
+
+def test_nested_scopes_publish_to_own_bus() -> None:
+    # given
+    outer_bus = InMemoryEventBus()
+    inner_bus = InMemoryEventBus()
+    wallet = Wallet(Money(10))
+
+    # when
+    with publishing(outer_bus):
+        wallet.transact(Money(1))
+        with publishing(inner_bus):
+            wallet.transact(Money(2))
+        wallet.transact(Money(3))
+
+    # then
+    assert [event.amount.value for event in outer_bus.events] == [1, 3]
+    assert [event.amount.value for event in inner_bus.events] == [2]
+
+
+def test_isolates_events_between_threads() -> None:
+    # given
+    buses = [InMemoryEventBus() for _ in range(4)]
+    barrier = Barrier(len(buses))
+
+    def work(bus: InMemoryEventBus, amount: int) -> None:
+        wallet = Wallet(Money(10))
+        with publishing(bus):
+            barrier.wait()
+            for _ in range(100):
+                wallet.transact(Money(amount))
+
+    threads = [Thread(target=work, args=(bus, index + 1)) for index, bus in enumerate(buses)]
+
+    # when
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # then
+    for index, bus in enumerate(buses):
+        assert len(bus.events) == 100
+        assert {event.amount.value for event in bus.events} == {index + 1}
+
+
+def test_isolates_events_between_tasks() -> None:
+    # given
+    async def request(amount: int) -> InMemoryEventBus:
+        bus = InMemoryEventBus()
+        wallet = Wallet(Money(10))
+        with publishing(bus):
+            for _ in range(10):
+                wallet.transact(Money(amount))
+                await asyncio.sleep(0)
+        return bus
+
+    async def main():
+        return await asyncio.gather(request(1), request(2))
+
+    # when
+    first, second = asyncio.run(main())
+
+    # then
+    assert {event.amount.value for event in first.events} == {1}
+    assert {event.amount.value for event in second.events} == {2}
@@ -0,0 +1,50 @@
+from uuid import uuid4
+
+import pytest
+
+from domain.entity import Entity, Id
+
+
+def test_generates_id_for_new_entity() -> None:
+    # given
+    first = Entity()
+    second = Entity()
+
+    # then
+    assert first.id != second.id
+
+
+def test_ids_with_same_value_are_equal() -> None:
+    # given
+    value = str(uuid4())
+
+    # when
+    first = Id(value)
+    second = Id(value)
+
+    # then
+    assert first == second
+    assert hash(first) == hash(second)
+    assert {first: "wallet"}[second] == "wallet"
+    assert first.value is second.value
+
+
+def test_can_create_id_from_raw_bytes() -> None:
+    # given
+    value = uuid4()
+
+    # when
+    identifier = Id.from_bytes(value.bytes)
+
+    # then
+    assert identifier == Id(str(value))
+    assert str(identifier) == str(value)
+
+
+def test_rejects_raw_bytes_of_wrong_length() -> None:
+    # given
+    value = uuid4().bytes[:15]
+
+    # then
+    with pytest.raises(ValueError):
+        Id.from_bytes(value)
@@ -1,6 +1,6 @@
 from domain.event import DomainEvent
 from domain.money import Money
-from domain.wallet import WalletLocked
+from domain.wallet import FundsWithdrawn, OverdraftLimitHit, OverdraftOccurred, WalletLocked
 from domain.wallet_event_as_a_result_of_method_invocation import Wallet
 
 
@@ -23,3 +23,32 @@ def test_static_publication_mechanism() -> None:
         collected.append(event)
 
     assert isinstance(collected[-1], WalletLocked)
+
+
+def test_state_changes_without_reading_events() -> None:
+    # given
+    wallet = Wallet(Money(10))
+
+    # when
+    events = wallet.transact(Money(-25))
+
+    # then
+    assert wallet.locked
+    assert wallet.balance.value == -25
+    assert events.types() == [FundsWithdrawn, OverdraftOccurred, OverdraftLimitHit, WalletLocked]
+
+
+def test_materializes_only_requested_events() -> None:
+    # given
+    wallet = Wallet(Money(10))
+    events = wallet.transact(Money(-25))
+
+    # when
+    locked = list(events.of_type(WalletLocked))
+
+    # then
+    assert len(locked) == 1
+    assert locked[0].amount.value == -25
+    assert list(events._events) == [3]
+    assert events[-1] is locked[0]
+    assert [event.id for event in events] == [event.id for event in events]
@@ -1,5 +1,10 @@
+from typing import List
+
+import pytest
+
+from domain.entity import Id
 from domain.money import Money
-from domain.wallet import WalletLocked
+from domain.wallet import FundsDeposited, FundsWithdrawn, OverdraftLimitHit, OverdraftOccurred, WalletLocked
 from domain.wallet_internal_event_collection import Wallet
 
 
@@ -24,3 +29,102 @@ def test_event_collection_strategy() -> None:
     assert len(events) == 6
     assert isinstance(events[-1], WalletLocked)
 
+
+@pytest.mark.parametrize("amounts", [
+    [10, -5, 0, 3, -20, 7],
+    [5, -12, -4, 8, -30, 10, 10],
+    [-25, 10],
+    [],
+])
+def test_transact_many_matches_sequential_transactions(amounts: List[int]) -> None:
+    # given
+    sequential = Wallet(Money(10))
+    bulk = Wallet(Money(10))
+    expected_applied = 0
+    for amount in amounts:
+        if sequential.locked:
+            break
+        sequential.transact(Money(amount))
+        expected_applied += 1
+
+    # when
+    applied = bulk.transact_many([Money(amount) for amount in amounts])
+
+    # then
+    expected_events = sequential.collect_events()
+    events = bulk.collect_events()
+    assert applied == expected_applied
+    assert bulk.balance.value == sequential.balance.value
+    assert bulk.locked == sequential.locked
+    assert [type(event) for event in events] == [type(event) for event in expected_events]
+    assert [event.amount.value for event in events] == [event.amount.value for event in expected_events]
+
+
+def test_transact_many_fails_on_locked_wallet() -> None:
+    # given
+    wallet = Wallet(Money(10))
+    wallet.transact_many([Money(-20)])
+
+    # then
+    with pytest.raises(Exception, match="Wallet is locked*"):
+        wallet.transact_many([Money(10)])
+
+
+def test_transact_many_keeps_applied_amounts_on_failure() -> None:
+    # given
+    wallet = Wallet(Money(10))
+
+    # when
+    with pytest.raises(ValueError, match="Currencies mismatch"):
+        wallet.transact_many([Money(10), Money(5, "EUR"), Money(10)])
+
+    # then
+    assert wallet.balance.value == 10
+    assert len(wallet.collect_events()) == 1
+
+
+def test_can_restore_wallet_state() -> None:
+    # given
+    wallet_id = Id()
+
+    # when
+    wallet = Wallet.restore(wallet_id, Money(-5), Money(10), locked=True)
+
+    # then
+    assert wallet.id == wallet_id
+    assert wallet.balance.value == -5
+    assert wallet.locked
+    assert wallet.collect_events() == []
+
+
+def test_transact_many_ignores_zero_amounts_in_other_currency() -> None:
+    # given
+    sequential = Wallet(Money(10))
+    bulk = Wallet(Money(10))
+    amounts = [Money(5), Money(0, "EUR"), Money(-3)]
+    for amount in amounts:
+        sequential.transact(amount)
+
+    # when
+    applied = bulk.transact_many(amounts)
+
+    # then
+    assert applied == 3
+    assert bulk.balance.value == sequential.balance.value
+    assert [type(event) for event in bulk.collect_events()] == [type(event) for event in sequential.collect_events()]
+
+
+def test_requeued_events_go_before_newer_ones() -> None:
+    # given
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(5))
+    collected = wallet.collect_events()
+    wallet.transact(Money(-30))
+
+    # when
+    wallet.requeue_events(collected)
+
+    # then
+    assert [type(event) for event in wallet.collect_events()] == [
+        FundsDeposited, FundsWithdrawn, OverdraftOccurred, OverdraftLimitHit, WalletLocked
+    ]
@@ -0,0 +1,113 @@
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import pytest
+
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.wallet import FundsDeposited, WalletLocked
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.codec import BinaryCodec, CodecError, JsonCodec, SchemaRegistry, wallet_registry
+from infrastructure.event_store import SqliteEventStore
+
+
+def _wallet_events() -> List[DomainEvent]:
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+    wallet.transact(Money(Decimal("-15.25")))
+    wallet.transact(Money(Decimal("-15.25")))
+    float_wallet = Wallet(Money(10))
+    float_wallet.transact(Money(-2.5))
+    return wallet.collect_events() + float_wallet.collect_events()
+
+
+def _assert_same_events(decoded: List[DomainEvent], events: List[DomainEvent]) -> None:
+    assert [type(event) for event in decoded] == [type(event) for event in events]
+    for result, event in zip(decoded, events):
+        assert result.id == event.id
+        assert result.created_at == event.created_at
+        assert result.wallet_id.value == event.wallet_id.value
+        assert result.amount.value == event.amount.value
+        assert type(result.amount.value) is type(event.amount.value)
+        assert result.amount.currency == event.amount.currency
+
+
+@pytest.mark.parametrize("codec", [BinaryCodec(wallet_registry()), JsonCodec(wallet_registry())])
+def test_can_serialize_wallet_events(codec) -> None:
+    # given
+    events = _wallet_events()
+
+    # when
+    decoded = [codec.deserialize(codec.serialize(event)) for event in events]
+
+    # then
+    _assert_same_events(decoded, events)
+    assert isinstance(decoded[6], WalletLocked)
+    assert decoded[6].name == "wallet.WalletLocked"
+
+
+def test_can_encode_many_events_into_single_buffer() -> None:
+    # given
+    codec = BinaryCodec(wallet_registry())
+    events = _wallet_events()
+
+    # when
+    buffer = codec.encode_many(events)
+    decoded = codec.decode_many(memoryview(buffer))
+
+    # then
+    _assert_same_events(decoded, events)
+    assert len(buffer) < 60 * len(events)
+
+
+def test_fails_on_unregistered_event() -> None:
+    # given
+    class UnknownEvent(DomainEvent):
+        @property
+        def namespace(self) -> str:
+            return "test"
+
+    # then
+    with pytest.raises(CodecError):
+        BinaryCodec(wallet_registry()).serialize(UnknownEvent())
+
+
+def test_can_decode_previous_schema_version() -> None:
+    # given
+    class Renamed(DomainEvent):
+        @property
+        def namespace(self) -> str:
+            return "test"
+
+    def upcast(attributes: Dict[str, Any]) -> Dict[str, Any]:
+        attributes["total"] = attributes.pop("amount")
+        return attributes
+
+    old_registry = SchemaRegistry()
+    old_registry.register(Renamed, 1, [("amount", "int")])
+    registry = SchemaRegistry()
+    registry.register(Renamed, 1, [("amount", "int")], upcast=upcast)
+    registry.register(Renamed, 1, [("total", "int"), ("label", "str")], version=2)
+    event = Renamed()
+    event.amount = -7
+
+    # when
+    decoded = BinaryCodec(registry).deserialize(BinaryCodec(old_registry).serialize(event))
+
+    # then
+    assert decoded.total == -7
+    assert decoded.id == event.id
+
+
+def test_can_be_used_by_event_store() -> None:
+    # given
+    store = SqliteEventStore(serializer=BinaryCodec(wallet_registry()))
+    events = _wallet_events()[:7]
+    wallet_id = events[0].wallet_id
+
+    # when
+    store.append(wallet_id, events, expected_version=0)
+
+    # then
+    _assert_same_events(store.load(wallet_id), events)
+    assert isinstance(store.load(wallet_id)[0], FundsDeposited)
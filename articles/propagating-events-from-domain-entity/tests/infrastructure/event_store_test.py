@@ -0,0 +1,159 @@
+from pathlib import Path
+from sqlite3 import OperationalError
+
+import pytest
+
+from domain.entity import Id
+from domain.money import Money
+from domain.wallet import WalletLocked
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import ConcurrencyError, SqliteEventStore
+
+
+def test_can_append_and_load_aggregate_stream() -> None:
+    # given
+    store = SqliteEventStore()
+    wallet = Wallet(Money(10))
+    other_wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+    wallet.transact(Money(-15))
+    wallet.transact(Money(-15))
+    other_wallet.transact(Money(5))
+
+    # when
+    version = store.append(wallet.id, wallet.collect_events(), expected_version=0)
+    store.append(other_wallet.id, other_wallet.collect_events(), expected_version=0)
+    events = store.load(wallet.id)
+
+    # then
+    assert version == 7
+    assert len(events) == 7
+    assert isinstance(events[-1], WalletLocked)
+    assert events[-1].wallet_id.value == wallet.id.value
+    assert len(store.load(other_wallet.id)) == 1
+    assert len(store.load(wallet.id, from_version=5)) == 2
+
+
+def test_fails_on_unexpected_version() -> None:
+    # given
+    store = SqliteEventStore()
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+    store.append(wallet.id, wallet.collect_events(), expected_version=0)
+
+    # then
+    with pytest.raises(ConcurrencyError):
+        store.append(wallet.id, [], expected_version=0)
+
+
+def test_batches_appends_until_flush(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "events.db")
+    store = SqliteEventStore(path, batch_size=10)
+    reader = SqliteEventStore(path)
+    wallet = Wallet(Money(10))
+    for _ in range(3):
+        wallet.transact(Money(1))
+
+    # when
+    store.append(wallet.id, wallet.collect_events(), expected_version=0)
+
+    # then
+    assert reader.version(Id(str(wallet.id.value))) == 0
+
+    # when
+    store.flush()
+
+    # then
+    assert len(reader.load(wallet.id)) == 3
+
+
+def test_detects_concurrent_writers(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "events.db")
+    first = SqliteEventStore(path)
+    second = SqliteEventStore(path)
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(1))
+    events = wallet.collect_events()
+    second.version(wallet.id)
+
+    # when
+    first.append(wallet.id, events, expected_version=0)
+    first.flush()
+    second.append(wallet.id, events, expected_version=0)
+
+    # then
+    with pytest.raises(ConcurrencyError):
+        second.flush()
+
+
+def test_keeps_streams_that_did_not_conflict(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "events.db")
+    first = SqliteEventStore(path)
+    second = SqliteEventStore(path, batch_size=10)
+    contested = Wallet(Money(10))
+    unrelated = Wallet(Money(10))
+    contested.transact(Money(1))
+    unrelated.transact(Money(2))
+    contested_events = contested.collect_events()
+    second.version(contested.id)
+    first.append(contested.id, contested_events, expected_version=0)
+    first.flush()
+
+    # when
+    second.append(contested.id, contested_events, expected_version=0)
+    second.append(unrelated.id, unrelated.collect_events(), expected_version=0)
+    with pytest.raises(ConcurrencyError):
+        second.flush()
+    second.flush()
+
+    # then
+    assert len(first.load(unrelated.id)) == 1
+    assert second.version(contested.id) == 1
+
+
+def test_names_conflicting_aggregates_when_append_flushes(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "events.db")
+    first = SqliteEventStore(path)
+    second = SqliteEventStore(path, batch_size=2)
+    contested = Wallet(Money(10))
+    unrelated = Wallet(Money(10))
+    contested.transact(Money(1))
+    unrelated.transact(Money(2))
+    contested_events = contested.collect_events()
+    second.version(contested.id)
+    first.append(contested.id, contested_events, expected_version=0)
+    first.flush()
+    second.append(contested.id, contested_events, expected_version=0)
+
+    # when
+    with pytest.raises(ConcurrencyError, match=str(contested.id.value)) as error:
+        second.append(unrelated.id, unrelated.collect_events(), expected_version=0)
+    second.flush()
+
+    # then
+    assert error.value.aggregate_ids == [contested.id.value]
+    assert len(first.load(unrelated.id)) == 1
+
+
+def test_keeps_pending_events_when_database_is_locked(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "events.db")
+    store = SqliteEventStore(path, batch_size=10, timeout=0.01)
+    blocker = SqliteEventStore(path)
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(1))
+    store.append(wallet.id, wallet.collect_events(), expected_version=0)
+    blocker.connection.execute("BEGIN IMMEDIATE")
+
+    # when
+    with pytest.raises(OperationalError):
+        store.flush()
+    blocker.connection.execute("ROLLBACK")
+    store.flush()
+
+    # then
+    assert len(blocker.load(wallet.id)) == 1
@@ -0,0 +1,193 @@
+import logging
+from pathlib import Path
+from sqlite3 import IntegrityError, connect
+from time import sleep
+
+import pytest
+
+from domain.event import DomainEvent
+from domain.money import Money
+from domain.wallet import WalletLocked
+from domain.wallet_event_bus_injection import InMemoryEventBus
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.outbox import Outbox, OutboxRelay
+from infrastructure.wallet_store import SqliteWalletStore
+
+
+def test_stores_events_with_aggregate() -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+    wallet.transact(Money(-15))
+    wallet.transact(Money(-15))
+
+    # when
+    store.save(wallet)
+
+    # then
+    restored = store.get(wallet.id)
+    assert restored.balance.value == -20
+    assert restored.locked
+    assert store.outbox.pending() == 7
+    assert wallet.collect_events() == []
+
+
+def test_discards_events_when_transaction_fails() -> None:
+    # given
+    connection = connect(":memory:")
+    outbox = Outbox(connection)
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+
+    # when
+    with pytest.raises(RuntimeError):
+        with connection:
+            outbox.record(wallet.collect_events())
+            raise RuntimeError("Failed to persist aggregate")
+
+    # then
+    assert outbox.pending() == 0
+
+
+def test_keeps_events_on_aggregate_when_save_fails() -> None:
+    # given
+    connection = connect(":memory:")
+    store = SqliteWalletStore(connection)
+    connection.execute("CREATE TRIGGER reject BEFORE INSERT ON outbox BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+
+    # when
+    with pytest.raises(IntegrityError):
+        store.save(wallet)
+
+    # then
+    assert store.get(wallet.id) is None
+    assert store.outbox.pending() == 0
+    assert len(wallet.collect_events()) == 1
+
+
+def test_relays_events_in_batches_without_duplicates() -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    bus = InMemoryEventBus()
+    relay = OutboxRelay(store.outbox, bus, batch_size=4)
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+    wallet.transact(Money(-15))
+    wallet.transact(Money(-15))
+    events = wallet.collect_events()
+    with store.outbox.connection:
+        store.outbox.record(events)
+        store.outbox.record(events)
+
+    # when
+    first_batch = relay.relay_once()
+    second_batch = relay.relay_once()
+    third_batch = relay.relay_once()
+
+    # then
+    assert (first_batch, second_batch, third_batch) == (4, 3, 0)
+    assert [event.id for event in bus.events] == [event.id for event in events]
+    assert isinstance(bus.events[-1], WalletLocked)
+    assert relay.metrics.published == 7
+    assert relay.metrics.batches == 2
+
+
+def test_redelivers_events_after_publish_failure() -> None:
+    # given
+    class FlakyEventBus(InMemoryEventBus):
+        def publish(self, event: DomainEvent) -> None:
+            if len(self.events) == 1 and not self.failed:
+                self.failed = True
+                raise ConnectionError("Broker unavailable")
+            super().publish(event)
+
+    outbox = Outbox(connect(":memory:"))
+    bus = FlakyEventBus()
+    bus.failed = False
+    relay = OutboxRelay(outbox, bus)
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+    wallet.transact(Money(-15))
+    with outbox.connection:
+        outbox.record(wallet.collect_events())
+
+    # when
+    with pytest.raises(ConnectionError):
+        relay.relay_once()
+    relay.relay_once()
+
+    # then
+    assert len(bus.events) == 3
+    assert relay.metrics.failures == 1
+    assert outbox.pending() == 0
+
+
+def test_measures_relay_lag() -> None:
+    # given
+    now = [0.0]
+    outbox = Outbox(connect(":memory:"))
+    relay = OutboxRelay(outbox, InMemoryEventBus(), clock=lambda: now[0])
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+    events = wallet.collect_events()
+    with outbox.connection:
+        outbox.record(events)
+    now[0] = events[0].created_at.timestamp() + 2.5
+
+    # then
+    assert relay.lag == pytest.approx(2.5)
+
+    # when
+    relay.relay_once()
+
+    # then
+    assert relay.lag == 0.0
+    assert relay.metrics.last_lag == pytest.approx(2.5)
+
+
+def test_relay_worker_publishes_in_background(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "wallets.db")
+    store = SqliteWalletStore(connect(path))
+    bus = InMemoryEventBus()
+    relay = OutboxRelay(Outbox(connect(path, check_same_thread=False)), bus, poll_interval=0.01)
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+
+    # when
+    relay.start()
+    store.save(wallet)
+    for _ in range(100):
+        if bus.events:
+            break
+        sleep(0.01)
+    relay.stop()
+
+    # then
+    assert len(bus.events) == 1
+
+
+def test_relay_worker_logs_publish_failures(caplog: pytest.LogCaptureFixture) -> None:
+    # given
+    class FailingEventBus:
+        def publish(self, event: DomainEvent) -> None:
+            raise RuntimeError("Broker is down")
+
+    store = SqliteWalletStore(connect(":memory:", check_same_thread=False))
+    wallet = Wallet(Money(10))
+    wallet.transact(Money(10))
+    store.save(wallet)
+    relay = OutboxRelay(store.outbox, FailingEventBus(), poll_interval=0.01)
+
+    # when
+    with caplog.at_level(logging.ERROR):
+        relay.start()
+        sleep(0.05)
+        relay.stop()
+
+    # then
+    assert "Failed to relay outbox events" in caplog.text
+    assert relay.metrics.failures >= 1
@@ -0,0 +1,171 @@
+from pathlib import Path
+from sqlite3 import connect
+
+import pytest
+
+from domain.money import Money
+from domain.wallet_internal_event_collection import Wallet
+from infrastructure.event_store import ConcurrencyError
+from infrastructure.wallet_repository import WalletRepository
+from infrastructure.wallet_store import SqliteWalletStore
+
+
+def test_keeps_one_instance_per_session() -> None:
+    # given
+    repository = WalletRepository(SqliteWalletStore(connect(":memory:")))
+    wallet = Wallet(Money(10))
+    with repository.session() as session:
+        session.add(wallet)
+
+    # when
+    with repository.session() as session:
+        first = session.get(wallet.id)
+        second = session.get(wallet.id)
+
+    # then
+    assert first is second
+    assert first is not wallet
+    assert repository.metrics.hits == 1
+
+
+def test_writes_dirty_wallets_behind_in_batches() -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    repository = WalletRepository(store, flush_size=3)
+    wallets = [Wallet(Money(10)) for _ in range(4)]
+
+    # when
+    for wallet in wallets[:2]:
+        with repository.session() as session:
+            session.add(wallet)
+            wallet.transact(Money(5))
+
+    # then
+    assert repository.pending == 2
+    assert store.get(wallets[0].id) is None
+
+    # when
+    with repository.session() as session:
+        session.add(wallets[2])
+        wallets[2].transact(Money(5))
+
+    # then
+    assert store.get(wallets[0].id).balance.value == 5
+    assert store.outbox.pending() == 3
+    assert repository.metrics.flushes == 1
+    assert repository.metrics.flushed_wallets == 3
+
+
+def test_skips_unchanged_wallets() -> None:
+    # given
+    store = SqliteWalletStore(connect(":memory:"))
+    repository = WalletRepository(store)
+    wallet = Wallet(Money(10))
+    with repository.session() as session:
+        session.add(wallet)
+    repository.flush()
+
+    # when
+    with repository.session() as session:
+        session.get(wallet.id)
+    repository.flush()
+
+    # then
+    assert repository.pending == 0
+    assert repository.metrics.flushes == 1
+    assert store.fetch(wallet.id.value.bytes)[1] == 1
+
+
+def test_detects_conflicting_sessions() -> None:
+    # given
+    repository = WalletRepository(SqliteWalletStore(connect(":memory:")))
+    wallet = Wallet(Money(10))
+    with repository.session() as session:
+        session.add(wallet)
+
+    # then
+    with pytest.raises(ConcurrencyError):
+        with repository.session() as first:
+            first.get(wallet.id).transact(Money(1))
+            with repository.session() as second:
+                second.get(wallet.id).transact(Money(2))
+
+    # then
+    assert repository.metrics.conflicts == 1
+    with repository.session() as session:
+        assert session.get(wallet.id).balance.value == 2
+
+
+def test_detects_conflicts_with_other_writers(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "wallets.db")
+    repository = WalletRepository(SqliteWalletStore(connect(path)))
+    other = WalletRepository(SqliteWalletStore(connect(path)))
+    wallet = Wallet(Money(10))
+    with repository.session() as session:
+        session.add(wallet)
+    repository.flush()
+    with other.session() as session:
+        session.get(wallet.id).transact(Money(3))
+    other.flush()
+
+    # when
+    with repository.session() as session:
+        session.get(wallet.id).transact(Money(1))
+
+    # then
+    with pytest.raises(ConcurrencyError):
+        repository.flush()
+
+
+def test_writes_other_wallets_of_a_batch_when_one_conflicts(tmp_path: Path) -> None:
+    # given
+    path = str(tmp_path / "wallets.db")
+    store = SqliteWalletStore(connect(path))
+    repository = WalletRepository(store)
+    other = WalletRepository(SqliteWalletStore(connect(path)))
+    conflicting, first, second = Wallet(Money(10)), Wallet(Money(10)), Wallet(Money(10))
+    with repository.session() as session:
+        for wallet in (conflicting, first, second):
+            session.add(wallet)
+    repository.flush()
+    with other.session() as session:
+        session.get(conflicting.id).transact(Money(3))
+    other.flush()
+
+    # when
+    with repository.session() as session:
+        for wallet in (conflicting, first, second):
+            session.get(wallet.id).transact(Money(1))
+
+    # then
+    with pytest.raises(ConcurrencyError, match=str(conflicting.id)):
+        repository.flush()
+    assert repository.pending == 0
+    assert repository.metrics.conflicts == 1
+    assert store.get(conflicting.id).balance.value == 3
+    assert store.get(first.id).balance.value == 1
+    assert store.get(second.id).balance.value == 1
+    assert store.outbox.pending() == 3
+    with repository.session() as session:
+        assert session.get(conflicting.id).balance.value == 3
+
+
+def test_evicts_least_recently_used_wallets() -> None:
+    # given
+    repository = WalletRepository(SqliteWalletStore(connect(":memory:")), max_cache_bytes=1_000)
+    wallets = [Wallet(Money(10)) for _ in range(10)]
+    with repository.session() as session:
+        for wallet in wallets:
+            session.add(wallet)
+
+    # when
+    with repository.session() as session:
+        session.get(wallets[0].id)
+        session.get(wallets[-1].id)
+
+    # then
+    assert repository.cache_bytes <= 1_000
+    assert repository.metrics.evictions > 0
+    assert repository.metrics.misses == 1
+    assert repository.metrics.hits == 1